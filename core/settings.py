@@ -106,6 +106,18 @@ CACHES = {
     }
 }
 
+if os.environ.get('REDIS_URL'):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['REDIS_URL'],
+        'TIMEOUT': 300,
+    }
+
+CELERY_BROKER_URL = os.environ.get('CELERY_BROKER_URL', '')
+CELERY_RESULT_BACKEND = os.environ.get('CELERY_RESULT_BACKEND', CELERY_BROKER_URL)
+CELERY_RESULT_EXPIRES = 60 * 60
+CELERY_TASK_TRACK_STARTED = True
+
 RATE_LIMIT = {
     'max_requests': int(os.environ.get('RATE_LIMIT_MAX_REQUESTS', '10')),
     'window_seconds': int(os.environ.get('RATE_LIMIT_WINDOW_SECONDS', '60')),
@@ -162,7 +174,7 @@ LOGGING = {
     },
     'root': {
         'handlers': ['console', 'file'],
-        'level': 'INFO',
+        'level': 'INFO' if DEBUG else 'WARNING',
     },
     'loggers': {
         'django': {
@@ -172,7 +184,7 @@ LOGGING = {
         },
         'generator': {
             'handlers': ['console'],
-            'level': 'DEBUG',
+            'level': 'DEBUG' if DEBUG else 'WARNING',
             'propagate': False,
         },
     },
@@ -8,6 +8,7 @@ from django.contrib.auth.decorators import login_required
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
 from django.shortcuts import render
+from django.db import transaction
 from .models import Question, QuizSession, FlashcardSet, Flashcard, UserProfile, Notification
 from .utils import extract_text_from_file
 from .generators import (
@@ -90,38 +91,37 @@ def _save_questions_async(
     question_type: str,
     user=None
 ) -> list[Question]:
-    from django.db import transaction
-    
     share_id = str(uuid.uuid4())
-    saved = []
+    objs = []
+    
+    for q_data in questions_data:
+        q_text = q_data.get('question', '')
+        q_answer = q_data.get('answer', '')
+        
+        if isinstance(q_text, dict):
+            q_text = str(q_text)
+        if isinstance(q_answer, dict):
+            q_answer = '\n'.join(f"{k}: {v}" for k, v in q_answer.items())
+        
+        objs.append(Question(
+            user=user,
+            text=str(q_text),
+            topic=topic,
+            difficulty=difficulty,
+            marks=q_data.get('marks', 1),
+            answer=str(q_answer),
+            explanation=q_data.get('explanation', ''),
+            question_type=q_data.get('type', question_type.lower()),
+            bloom_level=q_data.get('bloom', 'understand'),
+            share_id=share_id if not objs else None,
+            source_text=q_data.get('source', ''),
+        ))
     
     with transaction.atomic():
-        for q_data in questions_data:
-            q_text = q_data.get('question', '')
-            q_answer = q_data.get('answer', '')
-            
-            if isinstance(q_text, dict):
-                q_text = str(q_text)
-            if isinstance(q_answer, dict):
-                q_answer = '\n'.join(f"{k}: {v}" for k, v in q_answer.items())
-            
-            q = Question.objects.create(
-                user=user,
-                text=str(q_text),
-                topic=topic,
-                difficulty=difficulty,
-                marks=q_data.get('marks', 1),
-                answer=str(q_answer),
-                explanation=q_data.get('explanation', ''),
-                question_type=q_data.get('type', question_type.lower()),
-                bloom_level=q_data.get('bloom', 'understand'),
-                share_id=share_id if not saved else None,
-                source_text=q_data.get('source', ''),
-            )
-            saved.append(q)
+        saved = Question.objects.bulk_create(objs)
     
     if user and hasattr(user, 'profile'):
-        user.profile.increment_question_count(len(saved_questions))
+        user.profile.increment_question_count(len(saved))
     
     return saved
 
@@ -160,24 +160,29 @@ def async_generate_flashcards(request: HttpRequest) -> JsonResponse:
         send_progress_update(task_id, 70, 'Processing', f'Creating {len(flashcards_data)} flashcards...')
         
         topic = filename.split('.')[0] if '.' in filename else filename
-        fc_set = FlashcardSet.objects.create(
-            topic=topic,
-            user=request.user if request.user.is_authenticated else None,
-        )
-        
-        cards = []
-        for i, c in enumerate(flashcards_data):
-            card = Flashcard.objects.create(
-                flashcard_set=fc_set,
-                front=c.get('front', ''),
-                back=c.get('back', ''),
-                order=i,
+        with transaction.atomic():
+            fc_set = FlashcardSet.objects.create(
+                topic=topic,
+                user=request.user if request.user.is_authenticated else None,
             )
-            cards.append({
+            
+            saved_cards = Flashcard.objects.bulk_create([
+                Flashcard(
+                    flashcard_set=fc_set,
+                    front=c.get('front', ''),
+                    back=c.get('back', ''),
+                    order=i,
+                )
+                for i, c in enumerate(flashcards_data)
+            ])
+        cards = [
+            {
                 'id': card.id,
                 'front': card.front,
                 'back': card.back,
-            })
+            }
+            for card in saved_cards
+        ]
         
         send_task_complete(task_id, True, {
             'flashcard_set_id': str(fc_set.set_id),
@@ -1,9 +1,18 @@
 from typing import Any
 import hashlib
-import json
-from functools import wraps
+import logging
+import os
+import re
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache, wraps
 from io import BytesIO
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 try:
     import google.genai as genai_client
     USE_NEW_API = True
@@ -13,92 +22,259 @@ except ImportError:
 
 from django.core.cache import cache
 
+logger = logging.getLogger(__name__)
+
+_EXECUTOR_WORKERS: int = 8
+
+_EXECUTOR: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=_EXECUTOR_WORKERS, thread_name_prefix='gemini')
+
+_TOPIC_CHUNK_CHARS: int = 12000
+
+_QUESTION_CHUNK_CHARS: int = 60000
+
+_QUESTION_MIN_CHUNK_CHARS: int = 4000
+
+_QUESTIONS_PER_BATCH: int = 10
+
+_JSON_MIME_CONFIG: dict[str, Any] = {"response_mime_type": "application/json"}
+
+_LOW_TEMPERATURE_CONFIG: dict[str, Any] = {"temperature": 0.2}
+
+_GENERATION_CONFIGS: dict[tuple[bool, bool], dict[str, Any] | None] = {
+    (False, False): None,
+    (True, False): _JSON_MIME_CONFIG,
+    (False, True): _LOW_TEMPERATURE_CONFIG,
+    (True, True): {**_JSON_MIME_CONFIG, **_LOW_TEMPERATURE_CONFIG},
+}
+
+_IN_FLIGHT: dict[str, Future] = {}
+_IN_FLIGHT_LOCK: threading.Lock = threading.Lock()
+
+_FENCE_RE: re.Pattern[str] = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+
+_JSON_RE: re.Pattern[str] = re.compile(r'\[\s*\{.*\]|\{.*\}', re.DOTALL)
+
+_TRAILING_COMMA_RE: re.Pattern[str] = re.compile(r',\s*(?=[\]}])')
+
+_WHITESPACE_RE: re.Pattern[str] = re.compile(r'\s+')
+
+_HYPHEN_BREAK_RE: re.Pattern[str] = re.compile(r'(?<=\w)-\s*\n\s*(?=\w)')
+
+_LATEX_SYMBOLS: dict[str, str] = {
+    'alpha': 'α', 'beta': 'β', 'gamma': 'γ', 'delta': 'δ', 'epsilon': 'ε', 'theta': 'θ',
+    'lambda': 'λ', 'mu': 'μ', 'pi': 'π', 'rho': 'ρ', 'sigma': 'σ', 'tau': 'τ', 'phi': 'φ',
+    'psi': 'ψ', 'omega': 'ω', 'Delta': 'Δ', 'Sigma': 'Σ', 'Omega': 'Ω',
+    'times': '×', 'cdot': '·', 'div': '÷', 'pm': '±', 'leq': '≤', 'geq': '≥', 'neq': '≠',
+    'approx': '≈', 'infty': '∞', 'rightarrow': '→', 'to': '→', 'langle': '⟨', 'rangle': '⟩',
+    'otimes': '⊗', 'sqrt': '√', 'degree': '°', 'left': '', 'right': '',
+}
+
+_LATEX_FRAC_RE: re.Pattern[str] = re.compile(r'\\frac\{([^{}]*)\}\{([^{}]*)\}')
+
+_LATEX_SQRT_RE: re.Pattern[str] = re.compile(r'\\sqrt\{([^{}]*)\}')
+
+_LATEX_CMD_NAMES: str = '|'.join(sorted(_LATEX_SYMBOLS, key=len, reverse=True))
+
+_LATEX_CMD_RE: re.Pattern[str] = re.compile(r'\\(' + _LATEX_CMD_NAMES + r')(?![A-Za-z])')
+
+_LATEX_BARE_CMD_RE: re.Pattern[str] = re.compile(r'\\(' + _LATEX_CMD_NAMES + r')(?![A-Za-z_.\d])')
 
-def cache_response(timeout: int = 300):
+_LATEX_MATH_RE: re.Pattern[str] = re.compile(r'\$\$?([^$]*\\[^$]*?)\$\$?')
+
+_LATEX_FIELDS: tuple[str, ...] = ('question', 'answer', 'explanation')
+
+
+def _convert_latex(text: str, command_re: re.Pattern[str]) -> str:
+    text = _LATEX_FRAC_RE.sub(r'(\1)/(\2)', text)
+    text = _LATEX_SQRT_RE.sub(r'√(\1)', text)
+    return command_re.sub(lambda m: _LATEX_SYMBOLS[m.group(1)], text)
+
+
+def _latex_to_unicode(text: str) -> str:
+    if '\\' not in text:
+        return text
+    text = _LATEX_MATH_RE.sub(lambda m: _convert_latex(m.group(1), _LATEX_CMD_RE), text)
+    return _convert_latex(text, _LATEX_BARE_CMD_RE)
+
+
+def _normalize_question_math(questions: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    for q in questions:
+        if not isinstance(q, dict):
+            continue
+        for field in _LATEX_FIELDS:
+            value = q.get(field)
+            if isinstance(value, str):
+                q[field] = _latex_to_unicode(value)
+    return questions
+
+
+def _normalize_for_cache(value: Any) -> str:
+    if not isinstance(value, str):
+        return str(value)
+    return _WHITESPACE_RE.sub(' ', _HYPHEN_BREAK_RE.sub('', value)).strip().casefold()
+
+
+def _make_cache_key(
+    func_name: str,
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+    normalize: bool = False,
+    version: str = '',
+) -> str:
+    to_text = _normalize_for_cache if normalize else str
+    hasher = hashlib.sha256()
+    for arg in args:
+        hasher.update(to_text(arg).encode())
+        hasher.update(b'\x1f')
+    for k, v in sorted(kwargs.items()):
+        hasher.update(f"{k}={to_text(v)}".encode())
+        hasher.update(b'\x1f')
+    if version:
+        return f"gemini:{func_name}:{version}:{hasher.hexdigest()}"
+    return f"gemini:{func_name}:{hasher.hexdigest()}"
+
+
+def cache_response(timeout: int = 300, normalize: bool = False, version: str = ''):
     def decorator(func):
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            cache_key_parts = [func.__name__]
-            for arg in args:
-                if isinstance(arg, str):
-                    cache_key_parts.append(arg[:100])
-            for k, v in sorted(kwargs.items()):
-                cache_key_parts.append(f"{k}:{str(v)[:50]}")
-            cache_key = f"gemini:{hashlib.md5('|'.join(cache_key_parts).encode()).hexdigest()}"
+            cache_key = _make_cache_key(func.__name__, args, kwargs, normalize, version)
             
             cached = cache.get(cache_key)
             if cached is not None:
+                wrapper.stats['hits'] += 1
                 return cached
             
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, timeout)
-            return result
+            with _IN_FLIGHT_LOCK:
+                in_flight: Future | None = _IN_FLIGHT.get(cache_key)
+                if in_flight is None:
+                    _IN_FLIGHT[cache_key] = future = Future()
+            if in_flight is not None:
+                wrapper.stats['coalesced'] += 1
+                return in_flight.result()
+            
+            wrapper.stats['misses'] += 1
+            try:
+                result = func(*args, **kwargs)
+                if result:
+                    cache.set(cache_key, result, timeout)
+                future.set_result(result)
+                return result
+            except BaseException as e:
+                future.set_exception(e)
+                raise
+            finally:
+                with _IN_FLIGHT_LOCK:
+                    del _IN_FLIGHT[cache_key]
+        wrapper.stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
         return wrapper
     return decorator
 
 
-def get_gemini_model() -> Any:
-    import os
+def _load_env() -> None:
     from dotenv import load_dotenv
     from django.conf import settings
     
-    dotenv_path = settings.BASE_DIR / '.env'
-    if not os.path.exists(dotenv_path):
-        dotenv_path = settings.BASE_DIR / 'QuestionGen' / '.env'
-    load_dotenv(dotenv_path=dotenv_path)
-    
+    for dotenv_path in (settings.BASE_DIR / '.env', settings.BASE_DIR / 'QuestionGen' / '.env'):
+        if dotenv_path.exists():
+            load_dotenv(dotenv_path=dotenv_path)
+            break
+
+
+_load_env()
+
+
+def get_gemini_model() -> Any:
     api_key: str | None = os.environ.get('GEMINI_API_KEY')
     if not api_key:
         raise ValueError("GEMINI_API_KEY environment variable not set")
     
-    if USE_NEW_API:
-        client = genai_client.Client(api_key=api_key)
-        return client
-    else:
-        genai_client.configure(api_key=api_key)
-        return genai_client.GenerativeModel('gemini-2.5-flash')
+    return _build_gemini_model(api_key)
 
 
-def generate_content_with_gemini(model: Any, prompt: str) -> Any:
+@lru_cache(maxsize=None)
+def _build_gemini_model(api_key: str) -> Any:
+    if USE_NEW_API:
+        return genai_client.Client(api_key=api_key)
+    genai_client.configure(api_key=api_key)
+    return genai_client.GenerativeModel('gemini-2.5-flash')
+
+
+def generate_content_with_gemini(
+    model: Any,
+    prompt: str,
+    json_output: bool = False,
+    deterministic: bool = False,
+) -> Any:
+    config: dict[str, Any] | None = _GENERATION_CONFIGS[(json_output, deterministic)]
     if USE_NEW_API:
         response = model.models.generate_content(
             model="gemini-2.0-flash",
-            contents=[{"role": "user", "parts": [{"text": prompt}]}]
+            contents=[{"role": "user", "parts": [{"text": prompt}]}],
+            config=config,
         )
-        return response.text
     else:
-        response = model.generate_content(prompt)
-        return response.text
+        response = model.generate_content(prompt, generation_config=config)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Gemini response (%d chars): %s", len(response.text), response.text)
+    return response.text
 
 
-def _clean_gemini_json(response_text: str) -> list[dict[str, Any]] | dict[str, Any]:
-    text: str = response_text.strip()
-    if text.startswith("```"):
-        text = text.split("```")[1]
-        if text.startswith("json"):
-            text = text[4:]
-        text = text.strip()
-    return json.loads(text)
+def _strip_fence(text: str) -> str:
+    match = _FENCE_RE.match(text)
+    return match.group(1) if match else text.strip()
 
 
-@cache_response(timeout=300)
-def generate_questions_with_gemini(
-    text: str,
-    difficulty: str,
-    num_questions: int = 5,
-    question_type: str = "MIXED"
-) -> list[dict[str, Any]]:
-    model: Any = get_gemini_model()
-    qtype: str = question_type.upper()
+def _clean_gemini_json(response_text: str) -> list[dict[str, Any]] | dict[str, Any]:
+    payload: str = _strip_fence(response_text)
+    try:
+        return _json_loads(payload)
+    except ValueError:
+        match = _JSON_RE.search(payload)
+        if match is None:
+            raise
+    try:
+        return _json_loads(match.group(0))
+    except ValueError:
+        return _json_loads(_TRAILING_COMMA_RE.sub('', match.group(0)))
 
-    bloom_instruction: str = """
+
+def _coerce_marks(value: Any) -> int:
+    if isinstance(value, bool):
+        return 1
+    if isinstance(value, int):
+        return value
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return 1
+    return int(number) if number.is_integer() else 1
+
+
+def _validate_questions(data: Any) -> list[dict[str, Any]]:
+    if not isinstance(data, list):
+        raise ValueError("Expected a JSON array of questions")
+    for i, item in enumerate(data, 1):
+        if not isinstance(item, dict):
+            raise ValueError(f"Question {i} is not a JSON object")
+        if not isinstance(item.get('question'), (str, dict)) or not item['question']:
+            raise ValueError(f"Question {i} has no question text")
+        if not isinstance(item.get('answer', ''), (str, dict)):
+            raise ValueError(f"Question {i} has an invalid answer")
+        if 'marks' in item:
+            item['marks'] = _coerce_marks(item['marks'])
+        if not isinstance(item.get('type', ''), str):
+            raise ValueError(f"Question {i} has an invalid type")
+    return data
+
+
+_BLOOM_INSTRUCTION: str = """
 Also, for EACH question, assign a Bloom's Taxonomy level from: remember, understand, apply, analyze, evaluate, create.
 Include it as a "bloom" field in the JSON."""
 
-    if qtype == "SHORT":
-        prompt: str = f"""Based on the following text, generate {num_questions} {difficulty} level SHORT ANSWER questions.
+_SHORT_PROMPT: str = """Based on the following text, generate {num_questions} {difficulty} level SHORT ANSWER questions.
 Each question should require a brief answer (1-3 sentences). Focus on key facts, definitions, and concepts.
-{bloom_instruction}
+{bloom}
 
 Text:
 {text}
@@ -106,8 +282,7 @@ Text:
 Return ONLY a JSON array, no markdown, no code blocks:
 [{{"question": "...", "answer": "...", "explanation": "", "marks": 2, "type": "short", "bloom": "understand"}}]"""
 
-    elif qtype == "MCQ":
-        prompt = f"""Based on the following text, generate {num_questions} {difficulty} level MULTIPLE CHOICE questions.
+_MCQ_PROMPT: str = """Based on the following text, generate {num_questions} {difficulty} level MULTIPLE CHOICE questions.
 
 CRITICAL FORMATTING RULES:
 1. The "question" field MUST contain the question stem FOLLOWED BY all 4 options on separate lines.
@@ -115,7 +290,7 @@ CRITICAL FORMATTING RULES:
 3. Use \\n to separate lines in the JSON string.
 4. The "answer" field should state the correct option letter and its full text.
 
-{bloom_instruction}
+{bloom}
 
 Text:
 {text}
@@ -125,10 +300,9 @@ Return ONLY a JSON array, no markdown, no code blocks:
 
 IMPORTANT: Every question MUST have exactly 4 options (A, B, C, D) embedded in the question field using \\n separators."""
 
-    elif qtype == "TF":
-        prompt = f"""Based on the following text, generate {num_questions} {difficulty} level TRUE or FALSE questions.
+_TF_PROMPT: str = """Based on the following text, generate {num_questions} {difficulty} level TRUE or FALSE questions.
 The "answer" field must be exactly "True" or "False". Mix true and false answers equally.
-{bloom_instruction}
+{bloom}
 
 Text:
 {text}
@@ -136,10 +310,9 @@ Text:
 Return ONLY a JSON array, no markdown, no code blocks:
 [{{"question": "Statement.", "answer": "True", "explanation": "Because ...", "marks": 1, "type": "true_false", "bloom": "remember"}}]"""
 
-    elif qtype == "LONG":
-        prompt = f"""Based on the following text, generate {num_questions} {difficulty} level LONG ANSWER questions.
+_LONG_PROMPT: str = """Based on the following text, generate {num_questions} {difficulty} level LONG ANSWER questions.
 Questions should require detailed, multi-paragraph answers.
-{bloom_instruction}
+{bloom}
 
 Text:
 {text}
@@ -147,10 +320,9 @@ Text:
 Return ONLY a JSON array, no markdown, no code blocks:
 [{{"question": "...", "answer": "Detailed answer...", "explanation": "", "marks": 5, "type": "long", "bloom": "analyze"}}]"""
 
-    elif qtype == "NUMERICAL":
-        prompt = f"""Based on the following text, generate {num_questions} {difficulty} level NUMERICAL/MATHEMATICAL problems.
+_NUMERICAL_PROMPT: str = """Based on the following text, generate {num_questions} {difficulty} level NUMERICAL/MATHEMATICAL problems.
 Use plain text math (x^2, sqrt(x), *, /). Include step-by-step solution in "explanation".
-{bloom_instruction}
+{bloom}
 
 Text:
 {text}
@@ -158,11 +330,10 @@ Text:
 Return ONLY a JSON array, no markdown, no code blocks:
 [{{"question": "...", "answer": "Final answer", "explanation": "Step 1: ... Final Answer: ...", "marks": 3, "type": "numerical", "bloom": "apply"}}]"""
 
-    else:
-        prompt = f"""Based on the following text, generate {num_questions} {difficulty} level questions with a MIX of types.
+_MIXED_PROMPT: str = """Based on the following text, generate {num_questions} {difficulty} level questions with a MIX of types.
 Include Short Answer, MCQ (4 options A-D), True/False, and Numerical. Set "type" to: short, mcq, true_false, numerical, or long.
 For MCQ questions: The "question" field MUST include the stem AND all 4 options (A), B), C), D)) separated by \\n.
-{bloom_instruction}
+{bloom}
 
 Text:
 {text}
@@ -171,17 +342,97 @@ Return ONLY a JSON array, no markdown, no code blocks:
 [{{"question": "What is X?\\nA) Option1\\nB) Option2\\nC) Option3\\nD) Option4", "answer": "A) Option1", "explanation": "", "marks": 1, "type": "mcq", "bloom": "remember"}},
 {{"question": "Define Y.", "answer": "Y is...", "explanation": "", "marks": 2, "type": "short", "bloom": "understand"}}]"""
 
+_QUESTION_PROMPTS: dict[str, str] = {
+    'SHORT': _SHORT_PROMPT,
+    'MCQ': _MCQ_PROMPT,
+    'TF': _TF_PROMPT,
+    'LONG': _LONG_PROMPT,
+    'NUMERICAL': _NUMERICAL_PROMPT,
+}
+
+_QUESTION_PROMPT_VERSION: str = hashlib.sha256(
+    ''.join([_BLOOM_INSTRUCTION, _MIXED_PROMPT, *_QUESTION_PROMPTS.values()]).encode()
+).hexdigest()[:8]
+
+
+def _generate_question_batch(
+    model: Any,
+    text: str,
+    difficulty: str,
+    num_questions: int,
+    question_type: str,
+) -> list[dict[str, Any]]:
+    prompt: str = _QUESTION_PROMPTS.get(question_type.upper(), _MIXED_PROMPT).format(
+        num_questions=num_questions,
+        difficulty=difficulty,
+        bloom=_BLOOM_INSTRUCTION,
+        text=text,
+    )
+    response_text = generate_content_with_gemini(model, prompt, json_output=True, deterministic=True)
+    return _normalize_question_math(_validate_questions(_clean_gemini_json(response_text)))
+
+
+def _merge_small_chunks(chunks: list[str], min_chars: int) -> list[str]:
+    merged: list[str] = []
+    for chunk in chunks:
+        if merged and (len(chunk) < min_chars or len(merged[-1]) < min_chars):
+            merged[-1] += chunk
+        else:
+            merged.append(chunk)
+    return merged
+
+
+def _question_quotas(chunks: list[str], num_questions: int) -> list[int]:
+    total: int = sum(len(chunk) for chunk in chunks)
+    shares: list[float] = [num_questions * len(chunk) / total for chunk in chunks]
+    quotas: list[int] = [int(share) for share in shares]
+    by_remainder: list[int] = sorted(range(len(chunks)), key=lambda i: shares[i] - quotas[i], reverse=True)
+    for i in by_remainder[:num_questions - sum(quotas)]:
+        quotas[i] += 1
+    return quotas
+
+
+@cache_response(timeout=60 * 60 * 24, normalize=True, version=_QUESTION_PROMPT_VERSION)
+def generate_questions_with_gemini(
+    text: str,
+    difficulty: str,
+    num_questions: int = 5,
+    question_type: str = "MIXED"
+) -> list[dict[str, Any]]:
+    model: Any = get_gemini_model()
+    wanted_batches: int = max(-(-num_questions // _QUESTIONS_PER_BATCH), 1)
+    chunk_chars: int = max(
+        min(_QUESTION_CHUNK_CHARS, -(-len(text) // wanted_batches)),
+        _QUESTION_MIN_CHUNK_CHARS,
+        -(-len(text) // max(num_questions, 1)),
+    )
+    pieces: int = max(min(-(-len(text) // chunk_chars), len(text) // _QUESTION_MIN_CHUNK_CHARS), 1)
+    chunks: list[str] = _merge_small_chunks(_split_text(text, -(-len(text) // pieces)), _QUESTION_MIN_CHUNK_CHARS)
+
     try:
-        response_text = generate_content_with_gemini(model, prompt)
-        return _clean_gemini_json(response_text)
+        if len(chunks) <= 1:
+            return _generate_question_batch(model, text, difficulty, num_questions, question_type)
+
+        futures: list[Future] = [
+            _EXECUTOR.submit(_generate_question_batch, model, chunk, difficulty, quota, question_type)
+            for chunk, quota in zip(chunks, _question_quotas(chunks, num_questions))
+            if quota
+        ]
+        seen: set[str] = set()
+        questions: list[dict[str, Any]] = []
+        for future in futures:
+            for question in future.result():
+                key: str = _normalize_for_cache(question['question'])
+                if key not in seen:
+                    seen.add(key)
+                    questions.append(question)
+        return questions[:num_questions]
     except Exception as e:
-        print(f"DEBUG: Error generating questions: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error generating questions")
         raise ValueError(f"Failed to generate questions: {str(e)}") from e
 
 
-@cache_response(timeout=300)
+@cache_response(timeout=300, normalize=True)
 def generate_flashcards_with_gemini(text: str) -> list[dict[str, str]]:
     model: Any = get_gemini_model()
     prompt: str = f"""Based on the following text, generate 10-20 flashcards for studying.
@@ -195,16 +446,31 @@ Return ONLY a JSON array, no markdown, no code blocks:
 [{{"front": "What is ...?", "back": "It is ..."}}]"""
 
     try:
-        response_text = generate_content_with_gemini(model, prompt)
+        response_text = generate_content_with_gemini(model, prompt, json_output=True, deterministic=True)
         return _clean_gemini_json(response_text)
     except Exception as e:
-        print(f"DEBUG: Error generating flashcards: {e}")
+        logger.warning("Error generating flashcards: %s", e)
         return []
 
 
-@cache_response(timeout=300)
-def extract_topics_with_gemini(text: str) -> list[dict[str, str]]:
-    model: Any = get_gemini_model()
+def _split_text(text: str, chunk_chars: int, max_chunks: int | None = None) -> list[str]:
+    chunks: list[str] = []
+    start: int = 0
+    length: int = len(text)
+    while start < length:
+        end: int = min(start + chunk_chars, length)
+        if max_chunks is not None and len(chunks) == max_chunks - 1:
+            end = length
+        if end < length:
+            cut: int = text.rfind('\n', start, end)
+            if cut > start:
+                end = cut
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def _extract_topics_from_chunk(model: Any, text: str) -> list[dict[str, str]]:
     prompt: str = f"""Analyze the following text and extract the key topics/concepts.
 For each, provide a brief explanation.
 
@@ -215,16 +481,44 @@ Return ONLY a JSON array, no markdown, no code blocks:
 [{{"topic": "Topic Name", "explanation": "Brief explanation"}}]
 
 Extract 5 to 15 topics."""
+    response_text = generate_content_with_gemini(model, prompt, json_output=True, deterministic=True)
+    topics = _clean_gemini_json(response_text)
+    if not isinstance(topics, list) or not all(isinstance(topic, dict) for topic in topics):
+        raise ValueError("Expected a JSON array of topic objects")
+    return topics
 
-    try:
-        response_text = generate_content_with_gemini(model, prompt)
-        return _clean_gemini_json(response_text)
-    except Exception as e:
-        print(f"DEBUG: Error extracting topics: {e}")
-        return []
 
-
-@cache_response(timeout=300)
+@cache_response(timeout=300, normalize=True)
+def extract_topics_with_gemini(text: str) -> list[dict[str, str]]:
+    model: Any = get_gemini_model()
+    chunk_chars: int = max(_TOPIC_CHUNK_CHARS, -(-len(text) // _EXECUTOR_WORKERS))
+    chunks: list[str] = _split_text(text, chunk_chars, max_chunks=_EXECUTOR_WORKERS)
+
+    if len(chunks) <= 1:
+        try:
+            return _extract_topics_from_chunk(model, text)
+        except Exception as e:
+            logger.warning("Error extracting topics: %s", e)
+            return []
+
+    futures: list[Future] = [_EXECUTOR.submit(_extract_topics_from_chunk, model, chunk) for chunk in chunks]
+    topics: list[dict[str, str]] = []
+    seen: set[str] = set()
+    for future in futures:
+        try:
+            chunk_topics: list[dict[str, str]] = future.result()
+        except Exception as e:
+            logger.warning("Error extracting topics: %s", e)
+            continue
+        for topic in chunk_topics:
+            key: str = str(topic.get('topic', '')).strip().lower()
+            if key and key not in seen:
+                seen.add(key)
+                topics.append(topic)
+    return topics
+
+
+@cache_response(timeout=300, normalize=True)
 def generate_short_notes_with_gemini(text: str) -> str | None:
     model: Any = get_gemini_model()
     prompt: str = f"""Generate concise short notes for studying from this text.
@@ -234,10 +528,10 @@ Text:
 {text}"""
 
     try:
-        response_text = generate_content_with_gemini(model, prompt)
+        response_text = generate_content_with_gemini(model, prompt, deterministic=True)
         return response_text.strip()
     except Exception as e:
-        print(f"DEBUG: Error generating notes: {e}")
+        logger.warning("Error generating notes: %s", e)
         return None
 
 
@@ -268,18 +562,11 @@ Evaluate the student's answer and return ONLY a JSON object (no markdown, no cod
 Be fair but thorough. Give partial marks where appropriate."""
 
     try:
-        response_text = generate_content_with_gemini(model, prompt)
+        response_text = generate_content_with_gemini(model, prompt, json_output=True)
         return _clean_gemini_json(response_text)
     except Exception as e:
-        print(f"DEBUG: Error evaluating answer: {e}")
-        return {
-            "score": 0,
-            "total": max_marks,
-            "strengths": "Error occurred",
-            "weaknesses": str(e),
-            "suggestions": "Please try again",
-            "model_answer": model_answer
-        }
+        logger.warning("Error evaluating answer: %s", e)
+        raise
 
 
 def regenerate_question_with_gemini(
@@ -298,13 +585,13 @@ Return ONLY a JSON object (not array):
 {{"question": "...", "answer": "...", "explanation": "...", "marks": {question.marks}, "type": "{question.question_type}", "bloom": "understand"}}"""
 
     try:
-        response_text = generate_content_with_gemini(model, prompt)
+        response_text = generate_content_with_gemini(model, prompt, json_output=True)
         data = _clean_gemini_json(response_text)
         if isinstance(data, list):
             data = data[0]
         return data
     except Exception as e:
-        print(f"DEBUG: Error regenerating question: {e}")
+        logger.warning("Error regenerating question: %s", e)
         raise
 
 
@@ -343,10 +630,10 @@ Text:
 {text}"""
 
     try:
-        response_text = generate_content_with_gemini(model, prompt)
+        response_text = generate_content_with_gemini(model, prompt, json_output=True)
         return _clean_gemini_json(response_text)
     except Exception as e:
-        print(f"DEBUG: Error generating quiz: {e}")
+        logger.warning("Error generating quiz: %s", e)
         raise
 
 
@@ -370,5 +657,5 @@ Provide suggestions in a structured format with ## headings for each category.""
         response_text = generate_content_with_gemini(model, prompt)
         return response_text.strip()
     except Exception as e:
-        print(f"DEBUG: Error suggesting improvements: {e}")
+        logger.warning("Error suggesting improvements: %s", e)
         return None
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-15 06:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0005_tag_userprofile_alter_flashcardset_options_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['topic', '-created_at'], name='generator_q_topic_16a43b_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0.1 on 2026-10-15 06:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('generator', '0006_question_topic_created_at_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='question',
+            index=models.Index(fields=['difficulty'], name='generator_q_difficu_1646cd_idx'),
+        ),
+    ]
@@ -81,6 +81,8 @@ class Question(models.Model):
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['topic', 'difficulty']),
+            models.Index(fields=['topic', '-created_at']),
+            models.Index(fields=['difficulty']),
             models.Index(fields=['question_type', 'bloom_level']),
             models.Index(fields=['-created_at']),
         ]
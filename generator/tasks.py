@@ -0,0 +1,23 @@
+from typing import Any
+from celery import shared_task
+
+from .generators import generate_questions_with_gemini
+
+
+@shared_task
+def generate_questions_task(
+    text: str,
+    topic: str,
+    difficulty: str,
+    num_questions: int,
+    question_type: str
+) -> dict[str, Any]:
+    from .views import _save_questions
+
+    questions_data = generate_questions_with_gemini(text, difficulty, num_questions, question_type)
+    if not questions_data:
+        raise ValueError('Could not generate questions. Please check your API key and try again.')
+
+    saved_questions = _save_questions(questions_data, topic, difficulty, question_type, share=True)
+    question_ids: str = ','.join(str(q.id) for q in saved_questions)
+    return {'redirect': f'/preview/?ids={question_ids}'}
@@ -2,9 +2,12 @@ import pytest
 from django.test import TestCase, Client
 from django.contrib.auth.models import User
 from django.urls import reverse
+from django.db import DatabaseError
 from django.core.files.uploadedfile import SimpleUploadedFile
 from io import BytesIO
+import itertools
 import json
+import re
 from unittest.mock import patch, MagicMock
 from generator.models import Question, QuizSession, FlashcardSet, Flashcard, Tag, QuestionBank
 
@@ -204,6 +207,31 @@ class ViewTests(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertIn('questions', response.context)
 
+    def test_history_view_filters_by_topic_and_difficulty(self):
+        from django.core.cache import cache
+        cache.clear()
+        Question.objects.create(text="What is a cell?", topic="Biology", difficulty="Hard")
+        response = self.client.get(reverse('history'), {'topic': 'Biology', 'difficulty': 'Hard'})
+        self.assertEqual([q.topic for q in response.context['questions']], ['Biology'])
+        self.assertEqual(response.context['topics'], ['Biology', 'Programming'])
+        self.assertEqual(response.context['current_difficulty'], 'Hard')
+
+    def test_history_view_paginates_with_cached_count(self):
+        from django.core.cache import cache
+        cache.clear()
+        Question.objects.bulk_create(
+            Question(text=f"Question {i}", topic="Paged", difficulty="Medium") for i in range(25)
+        )
+        response = self.client.get(reverse('history'), {'topic': 'Paged', 'page': 2})
+        page_obj = response.context['page_obj']
+        self.assertEqual(page_obj.number, 2)
+        self.assertEqual(len(page_obj.object_list), 5)
+        self.assertEqual(page_obj.paginator.count, 25)
+        self.assertContains(response, 'Page 2 of 2')
+
+        with self.assertNumQueries(1):
+            self.client.get(reverse('history'), {'topic': 'Paged'})
+
     def test_preview_questions_view(self):
         url = f"{reverse('preview_questions')}?ids={self.question.id}"
         response = self.client.get(url)
@@ -311,6 +339,14 @@ class ProtectedViewTests(TestCase):
         response = self.client.get(reverse('analytics'))
         self.assertEqual(response.status_code, 302)
 
+    def test_analytics_view_serializes_chart_data(self):
+        Question.objects.create(text="Q1", topic="Math", difficulty="Easy", question_type="short")
+        self.client.login(username='testuser', password='testpass123')
+        response = self.client.get(reverse('analytics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.context['difficulty_data']), {"Easy": 1})
+        self.assertEqual(json.loads(response.context['type_data']), {"short": 1})
+
 
 class APIViewTests(TestCase):
     def setUp(self):
@@ -371,6 +407,36 @@ class FileUploadTests(TestCase):
         })
         self.assertIn(response.status_code, [200, 400])
 
+    @patch('generator.tasks.generate_questions_task.delay')
+    def test_upload_ajax_enqueues_task_when_broker_configured(self, mock_delay):
+        from django.test import override_settings
+        mock_delay.return_value = MagicMock(id='task-123')
+        with override_settings(CELERY_BROKER_URL='redis://localhost:6379/1'):
+            response = self.client.post(
+                reverse('upload'),
+                {'pasted_text': 'Photosynthesis converts light to energy.', 'num_questions': 3},
+                HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+            )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status_url'], '/upload/status/task-123/')
+        mock_delay.assert_called_once_with(
+            'Photosynthesis converts light to energy.', 'Pasted Text', 'Medium', 3, 'SHORT'
+        )
+
+    @patch('generator.generators.generate_questions_with_gemini')
+    def test_upload_saves_generated_questions_and_redirects(self, mock_generate):
+        mock_generate.return_value = [
+            {"question": "What is chlorophyll?", "answer": "A pigment", "marks": 2, "type": "short"},
+        ]
+        response = self.client.post(reverse('upload'), {
+            'pasted_text': 'Chlorophyll absorbs light.',
+            'difficulty': 'Easy',
+            'num_questions': 1,
+        })
+        saved = Question.objects.get(text="What is chlorophyll?")
+        self.assertRedirects(response, f'/preview/?ids={saved.id}', fetch_redirect_response=False)
+        self.assertIsNotNone(saved.share_id)
+
 
 class UtilityFunctionTests(TestCase):
     def test_extract_text_from_pdf(self):
@@ -380,6 +446,52 @@ class UtilityFunctionTests(TestCase):
         with self.assertRaises(Exception):
             extract_text_from_file(file)
 
+    def test_normalize_pdf_text(self):
+        from generator.utils import _normalize_pdf_text
+        raw = 'Photo-\n  synthesis   is\x0c key.  \n\n\n\n  Next\t\tpara'
+        self.assertEqual(_normalize_pdf_text(raw), 'Photosynthesis is key.\n\nNext para')
+
+    def test_extract_text_from_generated_pdf(self):
+        from reportlab.pdfgen import canvas
+        from generator.utils import extract_text_from_file
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer)
+        pdf.drawString(72, 720, "Photosynthesis basics")
+        pdf.showPage()
+        pdf.save()
+        file = SimpleUploadedFile("notes.pdf", buffer.getvalue(), content_type="application/pdf")
+        self.assertIn("Photosynthesis basics", extract_text_from_file(file))
+
+    def test_extract_text_from_pdf_stops_at_max_chars(self):
+        from reportlab.pdfgen import canvas
+        from generator.utils import extract_text_from_file
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer)
+        for page in range(5):
+            pdf.drawString(72, 720, f"Page {page} content")
+            pdf.showPage()
+        pdf.save()
+        file = SimpleUploadedFile("long.pdf", buffer.getvalue(), content_type="application/pdf")
+        text = extract_text_from_file(file, max_chars=10)
+        self.assertLessEqual(len(text), 10)
+        self.assertTrue(text.startswith("Page 0"))
+
+    def test_extract_large_pdf_pages_in_parallel_keeps_order(self):
+        from reportlab.pdfgen import canvas
+        from generator.utils import (
+            _PARALLEL_PDF_PAGE_THRESHOLD, _extract_pdf_pages_pdfium, _extract_pdf_pages_pypdf2,
+        )
+        buffer = BytesIO()
+        pdf = canvas.Canvas(buffer)
+        page_count = _PARALLEL_PDF_PAGE_THRESHOLD + 5
+        for page in range(page_count):
+            pdf.drawString(72, 720, f"Page number {page}")
+            pdf.showPage()
+        pdf.save()
+        expected = [f"Page number {i}" for i in range(page_count)]
+        self.assertEqual([p.strip() for p in _extract_pdf_pages_pypdf2(buffer.getvalue())], expected)
+        self.assertEqual([p.strip() for p in _extract_pdf_pages_pdfium(buffer.getvalue())], expected)
+
     def test_extract_text_from_unsupported_file(self):
         from generator.utils import extract_text_from_file
         content = b"test"
@@ -387,6 +499,16 @@ class UtilityFunctionTests(TestCase):
         with self.assertRaises(ValueError):
             extract_text_from_file(file)
 
+    def test_escape_pdf_text(self):
+        from generator.utils import escape_pdf_text
+        self.assertEqual(escape_pdf_text("a < b & c > d"), "a &lt; b &amp; c &gt; d")
+        self.assertEqual(escape_pdf_text("plain"), "plain")
+
+    def test_escape_pdf_texts_keeps_alignment(self):
+        from generator.utils import escape_pdf_texts
+        self.assertEqual(escape_pdf_texts(["x < 1", "", "a & b"]), ["x &lt; 1", "", "a &amp; b"])
+        self.assertEqual(escape_pdf_texts(["odd\x1fitem", "ok"]), ["odd\x1fitem", "ok"])
+
 
 class PDFGenerationTests(TestCase):
     def setUp(self):
@@ -406,6 +528,20 @@ class PDFGenerationTests(TestCase):
         buffer.seek(0)
         self.assertGreater(len(buffer.read()), 0)
 
+    def test_generate_pdf_file_with_numerical_steps(self):
+        from generator.utils import generate_pdf_file
+        numerical = Question.objects.create(
+            text="Is 2 + 2 < 5?",
+            answer="4",
+            explanation="Step 1: Add the numbers. Step 2: 2 + 2 = 4\nFinal Answer: 4",
+            topic="Math",
+            difficulty="Easy",
+            question_type="numerical",
+            marks=3
+        )
+        buffer = generate_pdf_file([numerical, self.question], "Math", include_answers=True)
+        self.assertGreater(len(buffer.getvalue()), 0)
+
     def test_generate_professional_pdf(self):
         from generator.utils import generate_professional_pdf
         buffer = generate_professional_pdf(
@@ -414,11 +550,88 @@ class PDFGenerationTests(TestCase):
         )
         self.assertIsInstance(buffer, BytesIO)
 
+    def test_generate_professional_pdf_escapes_markup(self):
+        from generator.utils import generate_professional_pdf
+        question = Question.objects.create(
+            text="Is x<y & y>2 when a<b and c>d?",
+            answer="Yes, when x < 5",
+            explanation="Both <conditions> hold & so on",
+            topic="Math",
+            difficulty="Easy",
+            question_type="short",
+            marks=1
+        )
+        buffer = generate_professional_pdf([question], "A & B", include_answers=True, institution="R&D <School>")
+        self.assertTrue(buffer.getvalue().startswith(b'%PDF'))
+
+    def test_download_preview_pdf_streams_attachment(self):
+        url = f"{reverse('download_preview_pdf')}?ids={self.question.id}"
+        response = Client().get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('attachment;', response['Content-Disposition'])
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_export_docx_loads_questions_in_one_query(self):
+        url = f"{reverse('export_docx')}?ids={self.question.id}"
+        with self.assertNumQueries(1):
+            response = Client().get(url)
+        self.assertEqual(response.status_code, 200)
+
     def test_generate_docx_file(self):
         from generator.utils import generate_docx_file
         buffer = generate_docx_file([self.question], "Test", include_answers=True)
         self.assertIsInstance(buffer, BytesIO)
 
+    @patch('generator.views._NOTES_IN_CACHE', False)
+    @patch('generator.views.generate_short_notes_with_gemini')
+    def test_download_notes_pdf(self, mock_notes):
+        mock_notes.return_value = "## Cells\n### Parts\n- Nucleus & membrane\n\nPlain <b> line"
+        study_file = SimpleUploadedFile("biology.txt", b"Cells and membranes.", content_type="text/plain")
+        self.client.post(reverse('short_notes'), {'study_file': study_file})
+        self.assertIn('short_notes', self.client.session)
+
+        response = self.client.get(reverse('download_notes_pdf'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertIn('biology_short_notes.pdf', response['Content-Disposition'])
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    @patch('generator.views._NOTES_IN_CACHE', True)
+    @patch('generator.views.generate_short_notes_with_gemini', return_value="## Cells")
+    def test_download_notes_pdf_from_shared_cache(self, mock_notes):
+        study_file = SimpleUploadedFile("biology.txt", b"Cells and membranes.", content_type="text/plain")
+        self.client.post(reverse('short_notes'), {'study_file': study_file})
+        self.assertNotIn('short_notes', self.client.session)
+
+        response = self.client.get(reverse('download_notes_pdf'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('biology_short_notes.pdf', response['Content-Disposition'])
+
+    @patch('generator.views.extract_text_from_file', return_value="Cached cell biology text")
+    @patch('generator.views.generate_short_notes_with_gemini', return_value="## Cells")
+    def test_uploaded_file_text_is_cached_by_content(self, mock_notes, mock_extract):
+        for _ in range(2):
+            study_file = SimpleUploadedFile("cells.pdf", b"%PDF-1.4 same bytes", content_type="application/pdf")
+            self.client.post(reverse('short_notes'), {'study_file': study_file})
+        self.assertEqual(mock_extract.call_count, 1)
+        mock_notes.assert_called_with("Cached cell biology text")
+
+    def test_download_notes_pdf_without_notes(self):
+        response = self.client.get(reverse('download_notes_pdf'))
+        self.assertEqual(response.status_code, 400)
+
+    def test_download_topics_pdf(self):
+        session = self.client.session
+        session['extracted_topics'] = [{'topic': 'Cells', 'explanation': 'Units of life'}]
+        session['extracted_topics_filename'] = 'biology.pdf'
+        session.save()
+        response = self.client.get(reverse('download_topics_pdf'))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('biology_topics.pdf', response['Content-Disposition'])
+        self.assertTrue(response.streaming)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
 
 class ValidatorsTest(TestCase):
     def test_minimum_length_validator(self):
@@ -535,6 +748,264 @@ class CacheDecoratorTests(TestCase):
         self.assertEqual(call_count, 2)
         self.assertEqual(result1, result2)
         self.assertNotEqual(result1, result3)
+        self.assertEqual(test_func.stats, {'hits': 1, 'misses': 2, 'coalesced': 0})
+
+    def test_cache_response_keys_on_full_arguments(self):
+        from generator.generators import cache_response
+
+        calls = []
+
+        @cache_response(timeout=60)
+        def test_func(text, count):
+            calls.append((text, count))
+            return [text, count]
+
+        prefix = "x" * 200
+        test_func(prefix + "a", 5)
+        test_func(prefix + "b", 5)
+        test_func(prefix + "a", 10)
+        test_func(prefix + "a", 5)
+
+        self.assertEqual(len(calls), 3)
+
+    def test_cache_response_coalesces_concurrent_identical_calls(self):
+        import threading
+        from generator.generators import cache_response
+
+        release = threading.Event()
+        calls = []
+
+        @cache_response(timeout=60)
+        def slow_generate(text):
+            calls.append(text)
+            release.wait(5)
+            return [text]
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(slow_generate("handout"))) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, [["handout"]] * 3)
+
+    def test_cache_response_normalized_key_matches_reflowed_text(self):
+        from generator.generators import cache_response
+
+        calls = []
+
+        @cache_response(timeout=60, normalize=True)
+        def summarize(text):
+            calls.append(text)
+            return text.upper()
+
+        summarize("Photosynthesis converts light\ninto chemical energy.")
+        summarize("  photosynthesis converts   light into chemi-\ncal energy. ")
+        summarize("Respiration releases energy.")
+
+        self.assertEqual(len(calls), 2)
+
+
+class TopicExtractionTests(TestCase):
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_long_text_is_chunked_and_merged(self, mock_model, mock_generate):
+        from generator.generators import _TOPIC_CHUNK_CHARS, extract_topics_with_gemini
+        mock_generate.side_effect = [
+            '[{"topic": "Cells", "explanation": "Units of life"}]',
+            '[{"topic": "cells", "explanation": "Duplicate"}, {"topic": "Energy", "explanation": "ATP"}]',
+            '[{"topic": "Enzymes", "explanation": "Catalysts"}]',
+        ]
+        paragraph = 'a' * (_TOPIC_CHUNK_CHARS // 2) + '\n'
+        topics = extract_topics_with_gemini(paragraph * 3 + 'b' * 10)
+
+        self.assertEqual(mock_generate.call_count, 3)
+        self.assertEqual(sorted(t['topic'].lower() for t in topics), ['cells', 'energy', 'enzymes'])
+
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_non_list_reply_is_skipped(self, mock_model, mock_generate):
+        from generator.generators import _TOPIC_CHUNK_CHARS, extract_topics_with_gemini
+        mock_generate.side_effect = lambda model, prompt, **kwargs: (
+            '{"topics": [{"topic": "Cells"}]}' if 'b' * 100 in prompt else '[{"topic": "Energy", "explanation": "ATP"}]'
+        )
+        text = 'a' * (_TOPIC_CHUNK_CHARS // 2) + '\n' + 'b' * (_TOPIC_CHUNK_CHARS // 2) + '\n' + 'c' * 10
+        self.assertEqual(extract_topics_with_gemini(text), [{"topic": "Energy", "explanation": "ATP"}])
+        mock_generate.side_effect = None
+        mock_generate.return_value = '{"topics": [{"topic": "Cells"}]}'
+        self.assertEqual(extract_topics_with_gemini('Another short text.'), [])
+
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_huge_text_is_capped_at_executor_workers(self, mock_model, mock_generate):
+        from generator.generators import _EXECUTOR_WORKERS, _TOPIC_CHUNK_CHARS, extract_topics_with_gemini
+        mock_generate.return_value = '[]'
+        paragraph = 'a' * (_TOPIC_CHUNK_CHARS // 3) + '\n'
+        text = paragraph * 200
+        extract_topics_with_gemini(text)
+
+        self.assertEqual(mock_generate.call_count, _EXECUTOR_WORKERS)
+        self.assertGreater(sum(len(call.args[1]) for call in mock_generate.call_args_list), len(text))
+
+
+class CachedGeminiViewTests(TestCase):
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_short_notes_reuses_cached_response(self, mock_model, mock_generate):
+        mock_generate.return_value = "## Cells\n- Basic unit of life"
+        data = {'pasted_text': 'Cells are the basic unit of life in every organism.'}
+        first = self.client.post(reverse('short_notes'), data)
+        second = self.client.post(reverse('short_notes'), data)
+
+        self.assertContains(first, 'Basic unit of life')
+        self.assertContains(second, 'Basic unit of life')
+        self.assertEqual(mock_generate.call_count, 1)
+
+
+class FlashcardViewTests(TestCase):
+    @patch('generator.views.generate_flashcards_with_gemini')
+    def test_flashcards_are_bulk_inserted_in_order(self, mock_cards):
+        mock_cards.return_value = [
+            {"front": "ATP", "back": "Energy currency"},
+            {"front": "DNA", "back": "Genetic material"},
+        ]
+        with self.assertNumQueries(4):
+            response = self.client.post(reverse('flashcards'), {'pasted_text': 'Cell biology basics.'})
+        self.assertEqual(response.context['cards'][1], {'front': 'DNA', 'back': 'Genetic material'})
+        self.assertEqual(list(Flashcard.objects.values_list('order', flat=True).order_by('order')), [0, 1])
+
+    @patch('generator.views.generate_flashcards_with_gemini')
+    def test_pasted_text_is_capped(self, mock_cards):
+        from generator.views import _MAX_SOURCE_CHARS
+        mock_cards.return_value = []
+        self.client.post(reverse('flashcards'), {'pasted_text': 'x' * (_MAX_SOURCE_CHARS + 500)})
+        self.assertEqual(len(mock_cards.call_args[0][0]), _MAX_SOURCE_CHARS)
+
+    @patch('generator.views.Flashcard.objects.bulk_create', side_effect=DatabaseError('disk full'))
+    @patch('generator.views.generate_flashcards_with_gemini')
+    def test_failed_card_insert_rolls_back_set(self, mock_cards, mock_bulk):
+        mock_cards.return_value = [{"front": "ATP", "back": "Energy currency"}]
+        response = self.client.post(reverse('flashcards'), {'pasted_text': 'Cell biology basics.'})
+        self.assertEqual(response.context['error'], 'disk full')
+        self.assertFalse(FlashcardSet.objects.exists())
+
+
+class QuestionPromptTests(TestCase):
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_prompt_template_is_filled_per_type(self, mock_model, mock_generate):
+        from generator.generators import _QUESTION_PROMPT_VERSION, generate_questions_with_gemini
+        mock_generate.return_value = '[{"question": "2 + 2?", "answer": "4", "marks": 3, "type": "numerical"}]'
+        generate_questions_with_gemini("Arithmetic {with braces}", "Hard", 4, "numerical")
+
+        prompt = mock_generate.call_args[0][1]
+        self.assertIn("generate 4 Hard level NUMERICAL/MATHEMATICAL problems", prompt)
+        self.assertIn("Arithmetic {with braces}", prompt)
+        self.assertIn('[{"question": "...", "answer": "Final answer"', prompt)
+        self.assertEqual(len(_QUESTION_PROMPT_VERSION), 8)
+
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_long_text_is_split_across_concurrent_calls(self, mock_model, mock_generate):
+        from generator.generators import _QUESTION_CHUNK_CHARS, generate_questions_with_gemini
+        mock_generate.side_effect = [
+            '[{"question": "Q1", "answer": "A"}, {"question": "Q2", "answer": "A2"}]',
+            '[{"question": "Q3", "answer": "A"}, {"question": "Q4", "answer": "A2"}]',
+        ]
+        paragraph = "x" * (_QUESTION_CHUNK_CHARS - 10) + "\n"
+        questions = generate_questions_with_gemini(paragraph * 2, "Easy", 3, "SHORT")
+
+        self.assertEqual(mock_generate.call_count, 2)
+        self.assertIn("generate 2 Easy level", mock_generate.call_args[0][1])
+        self.assertEqual(len(questions), 3)
+
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_uneven_tail_chunk_gets_proportional_quota(self, mock_model, mock_generate):
+        from generator.generators import generate_questions_with_gemini
+        counter = itertools.count()
+        mock_generate.side_effect = lambda model, prompt, **kwargs: json.dumps(
+            [{"question": f"Q{next(counter)}", "answer": "A"} for _ in range(2)]
+        )
+        text = 'a' * 25000 + '\n' + 'b' * 25000 + '\n' + 'c' * 11000
+        generate_questions_with_gemini(text, "Easy", 5, "SHORT")
+
+        requested = {
+            next(letter for letter in 'abc' if letter * 100 in call.args[1]): call.args[1]
+            for call in mock_generate.call_args_list
+        }
+        self.assertIn("generate 2 Easy level", requested['a'])
+        self.assertIn("generate 2 Easy level", requested['b'])
+        self.assertIn("generate 1 Easy level", requested['c'])
+
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_large_question_count_on_short_text_uses_one_call(self, mock_model, mock_generate):
+        from generator.generators import generate_questions_with_gemini
+        mock_generate.return_value = json.dumps([{"question": f"Q{i}", "answer": "A"} for i in range(25)])
+        questions = generate_questions_with_gemini("Cell biology basics.", "Easy", 25, "SHORT")
+
+        self.assertEqual(mock_generate.call_count, 1)
+        self.assertIn("generate 25 Easy level", mock_generate.call_args[0][1])
+        self.assertEqual(len(questions), 25)
+
+    @patch('generator.generators._generate_question_batch')
+    @patch('generator.generators.get_gemini_model')
+    def test_large_question_count_is_batched_across_distinct_sections(self, mock_model, mock_batch):
+        from generator.generators import _QUESTION_MIN_CHUNK_CHARS, generate_questions_with_gemini
+        counter = itertools.count()
+        mock_batch.side_effect = lambda model, chunk, difficulty, quota, question_type: [
+            {"question": f"Q{next(counter)}", "answer": "A"} for _ in range(quota)
+        ]
+        section_words = _QUESTION_MIN_CHUNK_CHARS * 5 // 16
+        sections = ["".join(f"{name} " for _ in range(section_words)) + "\n" for name in ("ATP", "DNA", "RNA")]
+        questions = generate_questions_with_gemini("".join(sections) + "Glossary\n", "Easy", 25, "SHORT")
+
+        self.assertEqual(mock_batch.call_count, 3)
+        chunks = [call.args[1] for call in mock_batch.call_args_list]
+        sizes = [len(chunk) for chunk in chunks]
+        self.assertLessEqual(max(sizes) - min(sizes), len("Glossary\n") + 2)
+        self.assertTrue(all(size >= _QUESTION_MIN_CHUNK_CHARS for size in sizes))
+        self.assertIn("Glossary", chunks[-1])
+        self.assertEqual(sorted(call.args[3] for call in mock_batch.call_args_list), [8, 8, 9])
+        self.assertEqual(len(questions), 25)
+
+
+class GeminiModelTests(TestCase):
+    def tearDown(self):
+        from generator.generators import _build_gemini_model
+        _build_gemini_model.cache_clear()
+
+    @patch.dict('os.environ', {'GEMINI_API_KEY': 'test-key'})
+    @patch('generator.generators.USE_NEW_API', False)
+    @patch('generator.generators.genai_client')
+    def test_get_gemini_model_reuses_instance(self, mock_genai):
+        from generator.generators import get_gemini_model
+        first = get_gemini_model()
+        second = get_gemini_model()
+        self.assertIs(first, second)
+        mock_genai.GenerativeModel.assert_called_once_with('gemini-2.5-flash')
+
+    @patch('generator.generators.USE_NEW_API', False)
+    def test_generate_content_uses_shared_low_temperature_config(self):
+        from generator.generators import generate_content_with_gemini
+        model = MagicMock()
+        model.generate_content.return_value.text = '[]'
+        self.assertEqual(generate_content_with_gemini(model, 'prompt', json_output=True, deterministic=True), '[]')
+        config = model.generate_content.call_args.kwargs['generation_config']
+        self.assertEqual(config, {"temperature": 0.2, "response_mime_type": "application/json"})
+
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_regenerate_keeps_default_sampling(self, mock_model, mock_generate):
+        from generator.generators import regenerate_question_with_gemini
+        mock_generate.return_value = '{"question": "New"}'
+        question = Question(topic="Cells", difficulty="Easy", question_type="short", marks=2)
+        self.assertEqual(regenerate_question_with_gemini(question), {"question": "New"})
+        self.assertNotIn('deterministic', mock_generate.call_args.kwargs)
 
 
 class SharePaperViewTests(TestCase):
@@ -585,6 +1056,18 @@ class RegenerateQuestionViewTests(TestCase):
         )
         self.assertIn(response.status_code, [404, 500])
 
+    @patch('generator.generators.generate_content_with_gemini')
+    @patch('generator.generators.get_gemini_model')
+    def test_regenerate_updates_question(self, mock_model, mock_generate):
+        mock_generate.return_value = '{"question": "New question", "answer": "New answer", "bloom": "apply"}'
+        response = self.client.post(
+            reverse('regenerate_question', kwargs={'question_id': self.question.id})
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Easy level Short Answer question about "Test"', mock_generate.call_args[0][1])
+        self.question.refresh_from_db()
+        self.assertEqual((self.question.text, self.question.bloom_level), ("New question", "apply"))
+
 
 class QuizFlowTests(TestCase):
     def setUp(self):
@@ -610,3 +1093,59 @@ class QuizFlowTests(TestCase):
         self.client.login(username='testuser', password='testpass123')
         response = self.client.get(reverse('start_quiz'))
         self.assertEqual(response.status_code, 302)
+
+
+class SaveQuestionsTests(TestCase):
+    def test_save_questions_bulk_inserts_with_single_share_id(self):
+        from generator.views import _save_questions
+        data = [
+            {"question": "Q1", "answer": "A1", "marks": 2, "type": "short"},
+            {"question": "Q2", "answer": {"a": 1}, "type": "mcq"},
+        ]
+        saved = _save_questions(data, "Topic", "Easy", "SHORT", share=True)
+        self.assertEqual(len(saved), 2)
+        self.assertTrue(all(q.pk for q in saved))
+        self.assertIsNotNone(saved[0].share_id)
+        self.assertIsNone(saved[1].share_id)
+        self.assertEqual(saved[1].answer, "a: 1")
+        self.assertEqual(Question.objects.filter(topic="Topic").count(), 2)
+
+
+class GeminiJsonParsingTests(TestCase):
+    def test_clean_gemini_json_strips_markdown_fence(self):
+        from generator.generators import _clean_gemini_json
+        fenced = '```json\n[{"question": "Q1", "answer": "A1"}]\n```'
+        self.assertEqual(_clean_gemini_json(fenced), [{"question": "Q1", "answer": "A1"}])
+
+    def test_latex_to_unicode(self):
+        from generator.generators import _latex_to_unicode
+        self.assertEqual(_latex_to_unicode(r"Find $\frac{1}{2} \times \sqrt{x}$"), "Find (1)/(2) × √(x)")
+        self.assertEqual(_latex_to_unicode(r"|\psi\rangle and \alpha \leq \pi"), "|ψ⟩ and α ≤ π")
+        self.assertEqual(_latex_to_unicode("costs $5 and $10"), "costs $5 and $10")
+        self.assertEqual(_latex_to_unicode(r"Open C:\temp\to_do and \\server\pi_share"), r"Open C:\temp\to_do and \\server\pi_share")
+        self.assertEqual(_latex_to_unicode(r"Rename \left.txt to \right2.txt"), r"Rename \left.txt to \right2.txt")
+        self.assertEqual(_latex_to_unicode(r"Print '\times_table' but $x_\pi \to \infty$"), r"Print '\times_table' but x_π → ∞")
+
+    def test_validate_questions_rejects_malformed_output(self):
+        from generator.generators import _validate_questions
+        valid = [{"question": "Q1", "answer": "A1", "marks": 2, "type": "short"}]
+        self.assertIs(_validate_questions(valid), valid)
+        for bad in ({"question": "Q1"}, ["Q1"], [{"answer": "A1"}]):
+            with self.assertRaises(ValueError):
+                _validate_questions(bad)
+
+    def test_validate_questions_coerces_marks(self):
+        from generator.generators import _validate_questions
+        data = [{"question": f"Q{i}", "marks": marks} for i, marks in enumerate(("2", 2.0, "two", 2.5, True, None))]
+        self.assertEqual([q["marks"] for q in _validate_questions(data)], [2, 2, 1, 1, 1, 1])
+
+    def test_clean_gemini_json_plain(self):
+        from generator.generators import _clean_gemini_json
+        self.assertEqual(_clean_gemini_json('  {"score": 3}  '), {"score": 3})
+
+    def test_clean_gemini_json_salvages_wrapped_payload(self):
+        from generator.generators import _clean_gemini_json
+        wrapped = 'Here are your questions:\n[{"question": "Q1", "answer": "A1"},]\nGood luck!'
+        self.assertEqual(_clean_gemini_json(wrapped), [{"question": "Q1", "answer": "A1"}])
+        with self.assertRaises(ValueError):
+            _clean_gemini_json('no json here')
@@ -6,6 +6,7 @@ urlpatterns = [
     path('', views.index, name='index'),
     path('features/', views.features, name='features'),
     path('upload/', views.upload, name='upload'),
+    path('upload/status/<str:task_id>/', views.upload_status, name='upload_status'),
     path('history/', views.history, name='history'),
 
     # Preview & Download
@@ -3,30 +3,75 @@ from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.pagesizes import letter
 from reportlab.lib import colors
 from reportlab.lib.units import inch
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import BrokenExecutor, Future, ProcessPoolExecutor
+from functools import lru_cache
 from io import BytesIO
-from typing import Any, TYPE_CHECKING
+from typing import Any, Callable, TYPE_CHECKING
+
+try:
+    from orjson import dumps as _orjson_dumps
+
+    def json_dumps(value: Any) -> str:
+        return _orjson_dumps(value).decode()
+except ImportError:
+    from json import dumps as json_dumps
 
 if TYPE_CHECKING:
     from .models import Question
 
 
-def generate_pdf_file(questions: list["Question"], topic: str, include_answers: bool = True) -> BytesIO:
-    try:
-        buffer: BytesIO = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=50, rightMargin=50, topMargin=50, bottomMargin=50)
-        
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle(
+logger = logging.getLogger(__name__)
+
+_STEP_SPLIT_RE: re.Pattern[str] = re.compile(r'\n|(?=Step )')
+
+_PDF_ESCAPE_TABLE: dict[int, str] = str.maketrans({
+    '&': '&amp;',
+    '<': '&lt;',
+    '>': '&gt;',
+})
+
+
+_BATCH_SEPARATOR: str = '\x1f'
+
+_PDF_HYPHEN_BREAK_RE: re.Pattern[str] = re.compile(r'(?<=\w)-[^\S\n]*\n[^\S\n]*(?=\w)')
+_PDF_INLINE_WS_RE: re.Pattern[str] = re.compile(r'[^\S\n]+')
+_PDF_LINE_EDGE_RE: re.Pattern[str] = re.compile(r' *\n *')
+_PDF_BLANK_LINES_RE: re.Pattern[str] = re.compile(r'\n{3,}')
+
+_PARALLEL_PDF_PAGE_THRESHOLD: int = 20
+_PDF_PAGES_PER_TASK: int = 8
+_PDF_WORKERS: int = min(os.cpu_count() or 1, 4)
+
+
+def escape_pdf_text(text: str) -> str:
+    if not text or ('&' not in text and '<' not in text and '>' not in text):
+        return text
+    return text.translate(_PDF_ESCAPE_TABLE)
+
+
+def escape_pdf_texts(texts: list[str]) -> list[str]:
+    escaped: list[str] = escape_pdf_text(_BATCH_SEPARATOR.join(texts)).split(_BATCH_SEPARATOR)
+    if len(escaped) != len(texts):
+        return [escape_pdf_text(text) for text in texts]
+    return escaped
+
+
+def _build_pdf_styles() -> dict[str, ParagraphStyle]:
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle(
             'CustomTitle',
             parent=styles['Heading1'],
             fontSize=24,
             textColor=colors.HexColor('#00d4ff'),
             spaceAfter=30,
             alignment=0
-        )
-        
-        question_style = ParagraphStyle(
+        ),
+        'question': ParagraphStyle(
             'CustomQuestion',
             parent=styles['BodyText'],
             fontSize=11,
@@ -34,9 +79,8 @@ def generate_pdf_file(questions: list["Question"], topic: str, include_answers:
             spaceAfter=6,
             leading=14,
             fontName='Helvetica-Bold'
-        )
-        
-        answer_style = ParagraphStyle(
+        ),
+        'answer': ParagraphStyle(
             'CustomAnswer',
             parent=styles['Italic'],
             fontSize=10,
@@ -45,9 +89,8 @@ def generate_pdf_file(questions: list["Question"], topic: str, include_answers:
             leading=13,
             leftIndent=20,
             fontName='Helvetica'
-        )
-        
-        explanation_style = ParagraphStyle(
+        ),
+        'explanation': ParagraphStyle(
             'CustomExplanation',
             parent=styles['BodyText'],
             fontSize=9,
@@ -58,9 +101,8 @@ def generate_pdf_file(questions: list["Question"], topic: str, include_answers:
             fontName='Helvetica',
             backColor=colors.HexColor('#f0f7ff'),
             borderPadding=8
-        )
-        
-        step_style = ParagraphStyle(
+        ),
+        'step': ParagraphStyle(
             'StepStyle',
             parent=styles['BodyText'],
             fontSize=9,
@@ -69,41 +111,137 @@ def generate_pdf_file(questions: list["Question"], topic: str, include_answers:
             leading=11,
             leftIndent=30,
             fontName='Helvetica'
-        )
+        ),
+    }
+
+
+def _build_professional_pdf_styles() -> dict[str, ParagraphStyle]:
+    styles = getSampleStyleSheet()
+    return {
+        'institution': ParagraphStyle(
+            'Institution',
+            parent=styles['Heading1'],
+            fontSize=16,
+            textColor=colors.black,
+            alignment=1,
+            spaceAfter=4,
+            fontName='Helvetica-Bold'
+        ),
+        'exam_title': ParagraphStyle(
+            'ExamTitle',
+            parent=styles['Heading2'],
+            fontSize=14,
+            textColor=colors.black,
+            alignment=1,
+            spaceAfter=4,
+            fontName='Helvetica-Bold'
+        ),
+        'meta': ParagraphStyle(
+            'Meta',
+            parent=styles['BodyText'],
+            fontSize=10,
+            textColor=colors.black,
+            alignment=1,
+            spaceAfter=2,
+            fontName='Helvetica'
+        ),
+        'section': ParagraphStyle(
+            'Section',
+            parent=styles['Heading2'],
+            fontSize=13,
+            textColor=colors.black,
+            spaceAfter=8,
+            spaceBefore=16,
+            fontName='Helvetica-Bold',
+            underlineProportion=1
+        ),
+        'q': ParagraphStyle(
+            'ProfQuestion',
+            parent=styles['BodyText'],
+            fontSize=11,
+            textColor=colors.black,
+            spaceAfter=4,
+            leading=14,
+            fontName='Helvetica'
+        ),
+        'option': ParagraphStyle(
+            'Option',
+            parent=styles['BodyText'],
+            fontSize=10,
+            textColor=colors.black,
+            spaceAfter=2,
+            leading=13,
+            leftIndent=20,
+            fontName='Helvetica'
+        ),
+        'answer_key_title': ParagraphStyle(
+            'AnswerKeyTitle',
+            parent=styles['Heading1'],
+            fontSize=14,
+            textColor=colors.black,
+            alignment=1,
+            spaceAfter=12,
+            fontName='Helvetica-Bold'
+        ),
+        'answer': ParagraphStyle(
+            'ProfAnswer',
+            parent=styles['BodyText'],
+            fontSize=10,
+            textColor=colors.HexColor('#2d5016'),
+            spaceAfter=4,
+            leading=13,
+            fontName='Helvetica'
+        ),
+    }
+
+
+_PDF_STYLES: dict[str, ParagraphStyle] = _build_pdf_styles()
+_PROFESSIONAL_PDF_STYLES: dict[str, ParagraphStyle] = _build_professional_pdf_styles()
+
+
+def generate_pdf_file(questions: list["Question"], topic: str, include_answers: bool = True) -> BytesIO:
+    try:
+        buffer: BytesIO = BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=50, rightMargin=50, topMargin=50, bottomMargin=50)
+        
+        styles = _PDF_STYLES
         
         story: list = []
         
         suffix: str = "" if include_answers else " (Questions Only)"
         title_text: str = f"Generated Questions: {topic}{suffix}"
-        title_p = Paragraph(title_text, title_style)
+        title_p = Paragraph(title_text, styles['title'])
         story.append(title_p)
         story.append(Spacer(1, 0.3*inch))
         
-        for i, q in enumerate(questions, 1):
-            q_type: str = getattr(q, 'question_type', 'mixed')
+        texts: list[str] = escape_pdf_texts([q.text for q in questions])
+        answers: list[str] = escape_pdf_texts([q.answer or '' for q in questions])
+        explanations: list[str] = escape_pdf_texts([q.explanation or '' for q in questions])
+        
+        for i, (q, text, answer, explanation) in enumerate(zip(questions, texts, answers, explanations), 1):
+            q_type: str = q.question_type
             type_label: str = " [Numerical]" if q_type == 'numerical' else ""
-            question_text: str = f"<b>{i}. {q.text}{type_label}</b>"
-            question_p = Paragraph(question_text, question_style)
+            question_text: str = f"<b>{i}. {text}{type_label}</b>"
+            question_p = Paragraph(question_text, styles['question'])
             story.append(question_p)
             story.append(Spacer(1, 0.08*inch))
             
             if include_answers:
-                if q.answer:
-                    answer_text: str = f"<b>Answer:</b> {q.answer}"
-                    answer_p = Paragraph(answer_text, answer_style)
+                if answer:
+                    answer_text: str = f"<b>Answer:</b> {answer}"
+                    answer_p = Paragraph(answer_text, styles['answer'])
                     story.append(answer_p)
                 
-                explanation: str = getattr(q, 'explanation', '')
                 if explanation:
                     story.append(Spacer(1, 0.05*inch))
-                    explanation_header = Paragraph("<b>Step-by-Step Solution:</b>", explanation_style)
+                    explanation_header = Paragraph("<b>Step-by-Step Solution:</b>", styles['explanation'])
                     story.append(explanation_header)
                     
-                    steps: list[str] = explanation.replace('Step ', '\nStep ').strip().split('\n')
+                    steps: list[str] = _STEP_SPLIT_RE.split(explanation)
                     for step in steps:
                         step = step.strip()
                         if step:
-                            step_p = Paragraph(step, step_style)
+                            step_p = Paragraph(step, styles['step'])
                             story.append(step_p)
             
             story.append(Spacer(1, 0.25*inch))
@@ -120,42 +258,170 @@ def generate_pdf_file(questions: list["Question"], topic: str, include_answers:
         buffer.seek(0)
         return buffer
         
-    except Exception as e:
-        print(f"ERROR in generate_pdf_file: {str(e)}")
-        import traceback
-        traceback.print_exc()
+    except Exception:
+        logger.exception("generate_pdf_file failed")
         raise
 
 
-def extract_text_from_file(uploaded_file: Any) -> str:
-    name: str = uploaded_file.name.lower()
-    
+def _pdf_page_ranges(page_count: int) -> list[tuple[int, int]]:
+    step: int = max(1, min(_PDF_PAGES_PER_TASK, -(-page_count // _PDF_WORKERS)))
+    return [(start, min(start + step, page_count)) for start in range(0, page_count, step)]
+
+
+@lru_cache(maxsize=1)
+def _pdf_process_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(max_workers=_PDF_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+
+
+def _extract_pdf_pages_parallel(
+    worker: Callable[[bytes, int, int], list[str]],
+    data: bytes,
+    page_count: int,
+    max_chars: int | None = None,
+) -> list[str]:
+    pool: ProcessPoolExecutor = _pdf_process_pool()
+    futures: list[Future] = [pool.submit(worker, data, start, stop) for start, stop in _pdf_page_ranges(page_count)]
+    parts: list[str] = []
+    total: int = 0
+    for i, future in enumerate(futures):
+        page_texts: list[str] = future.result()
+        parts.extend(page_texts)
+        total += sum(len(text) for text in page_texts)
+        if max_chars is not None and total >= max_chars:
+            for pending in futures[i + 1:]:
+                pending.cancel()
+            break
+    return parts
+
+
+def _pdfium_pages_text(pdf: Any, start: int, stop: int, max_chars: int | None = None) -> list[str]:
+    parts: list[str] = []
+    total: int = 0
+    for i in range(start, stop):
+        page = pdf[i]
+        textpage = page.get_textpage()
+        try:
+            page_text: str = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        if page_text:
+            parts.append(page_text)
+            total += len(page_text)
+            if max_chars is not None and total >= max_chars:
+                break
+    return parts
+
+
+def _extract_pdfium_page_range(data: bytes, start: int, stop: int) -> list[str]:
+    import pypdfium2 as pdfium
+    pdf = pdfium.PdfDocument(data)
+    try:
+        return _pdfium_pages_text(pdf, start, stop)
+    finally:
+        pdf.close()
+
+
+def _extract_pdf_pages_pdfium(data: bytes, max_chars: int | None = None) -> list[str]:
+    import pypdfium2 as pdfium
+    pdf = pdfium.PdfDocument(data)
+    try:
+        page_count: int = len(pdf)
+        if page_count <= _PARALLEL_PDF_PAGE_THRESHOLD:
+            return _pdfium_pages_text(pdf, 0, page_count, max_chars)
+    finally:
+        pdf.close()
+
+    try:
+        return _extract_pdf_pages_parallel(_extract_pdfium_page_range, data, page_count, max_chars)
+    except BrokenExecutor:
+        _pdf_process_pool.cache_clear()
+
+    pdf = pdfium.PdfDocument(data)
+    try:
+        return _pdfium_pages_text(pdf, 0, page_count, max_chars)
+    finally:
+        pdf.close()
+
+
+def _extract_pypdf2_page_range(data: bytes, start: int, stop: int) -> list[str]:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(BytesIO(data))
+    parts: list[str] = []
+    for i in range(start, stop):
+        page_text = reader.pages[i].extract_text()
+        if page_text:
+            parts.append(page_text)
+    return parts
+
+
+def _extract_pdf_pages_pypdf2(data: bytes, max_chars: int | None = None) -> list[str]:
+    import PyPDF2
+    reader = PyPDF2.PdfReader(BytesIO(data))
+    page_count: int = len(reader.pages)
+    if page_count > _PARALLEL_PDF_PAGE_THRESHOLD:
+        try:
+            return _extract_pdf_pages_parallel(_extract_pypdf2_page_range, data, page_count, max_chars)
+        except BrokenExecutor:
+            _pdf_process_pool.cache_clear()
+
+    parts: list[str] = []
+    total: int = 0
+    for page in reader.pages:
+        page_text = page.extract_text()
+        if page_text:
+            parts.append(page_text)
+            total += len(page_text)
+            if max_chars is not None and total >= max_chars:
+                break
+    return parts
+
+
+def _normalize_pdf_text(text: str) -> str:
+    text = _PDF_HYPHEN_BREAK_RE.sub('', text)
+    text = _PDF_INLINE_WS_RE.sub(' ', text)
+    text = _PDF_LINE_EDGE_RE.sub('\n', text)
+    return _PDF_BLANK_LINES_RE.sub('\n\n', text)
+
+
+def _extract_raw_text(uploaded_file: Any, name: str, max_chars: int | None) -> str:
     if name.endswith('.pdf'):
-        import PyPDF2
-        reader = PyPDF2.PdfReader(uploaded_file)
-        text: str = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        return text.strip()
+        data: bytes = uploaded_file.read()
+        try:
+            parts: list[str] = _extract_pdf_pages_pdfium(data, max_chars)
+        except Exception:
+            parts = _extract_pdf_pages_pypdf2(data, max_chars)
+        return _normalize_pdf_text("\n".join(parts))
     
     elif name.endswith('.docx'):
         import docx
         document = docx.Document(uploaded_file)
-        text = "\n".join(para.text for para in document.paragraphs)
-        return text.strip()
+        paragraphs: list[str] = []
+        total: int = 0
+        for para in document.paragraphs:
+            paragraphs.append(para.text)
+            total += len(para.text) + 1
+            if max_chars is not None and total >= max_chars:
+                break
+        return "\n".join(paragraphs)
     
     elif name.endswith('.txt'):
         raw = uploaded_file.read()
         if isinstance(raw, bytes):
-            return raw.decode('utf-8').strip()
-        return raw.strip()
+            return raw.decode('utf-8')
+        return raw
     
     else:
         raise ValueError(f"Unsupported file type: {name}")
 
 
+def extract_text_from_file(uploaded_file: Any, max_chars: int | None = None) -> str:
+    text: str = _extract_raw_text(uploaded_file, uploaded_file.name.lower(), max_chars).strip()
+    if max_chars is not None:
+        text = text[:max_chars].rstrip()
+    return text
+
+
 def generate_professional_pdf(
     questions: list["Question"],
     topic: str,
@@ -167,104 +433,22 @@ def generate_professional_pdf(
     buffer: BytesIO = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter, leftMargin=50, rightMargin=50, topMargin=40, bottomMargin=40)
 
-    styles = getSampleStyleSheet()
-
-    institution_style = ParagraphStyle(
-        'Institution',
-        parent=styles['Heading1'],
-        fontSize=16,
-        textColor=colors.black,
-        alignment=1,
-        spaceAfter=4,
-        fontName='Helvetica-Bold'
-    )
-
-    exam_title_style = ParagraphStyle(
-        'ExamTitle',
-        parent=styles['Heading2'],
-        fontSize=14,
-        textColor=colors.black,
-        alignment=1,
-        spaceAfter=4,
-        fontName='Helvetica-Bold'
-    )
-
-    meta_style = ParagraphStyle(
-        'Meta',
-        parent=styles['BodyText'],
-        fontSize=10,
-        textColor=colors.black,
-        alignment=1,
-        spaceAfter=2,
-        fontName='Helvetica'
-    )
-
-    section_style = ParagraphStyle(
-        'Section',
-        parent=styles['Heading2'],
-        fontSize=13,
-        textColor=colors.black,
-        spaceAfter=8,
-        spaceBefore=16,
-        fontName='Helvetica-Bold',
-        underlineProportion=1
-    )
-
-    q_style = ParagraphStyle(
-        'ProfQuestion',
-        parent=styles['BodyText'],
-        fontSize=11,
-        textColor=colors.black,
-        spaceAfter=4,
-        leading=14,
-        fontName='Helvetica'
-    )
-
-    option_style = ParagraphStyle(
-        'Option',
-        parent=styles['BodyText'],
-        fontSize=10,
-        textColor=colors.black,
-        spaceAfter=2,
-        leading=13,
-        leftIndent=20,
-        fontName='Helvetica'
-    )
-
-    answer_key_title_style = ParagraphStyle(
-        'AnswerKeyTitle',
-        parent=styles['Heading1'],
-        fontSize=14,
-        textColor=colors.black,
-        alignment=1,
-        spaceAfter=12,
-        fontName='Helvetica-Bold'
-    )
-
-    answer_style = ParagraphStyle(
-        'ProfAnswer',
-        parent=styles['BodyText'],
-        fontSize=10,
-        textColor=colors.HexColor('#2d5016'),
-        spaceAfter=4,
-        leading=13,
-        fontName='Helvetica'
-    )
+    styles = _PROFESSIONAL_PDF_STYLES
 
     story: list = []
 
     if institution:
-        story.append(Paragraph(institution, institution_style))
-    story.append(Paragraph(f"Examination: {topic}", exam_title_style))
+        story.append(Paragraph(escape_pdf_text(institution), styles['institution']))
+    story.append(Paragraph(f"Examination: {escape_pdf_text(topic)}", styles['exam_title']))
     story.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceAfter=6))
 
     meta_parts: list[str] = []
     if duration:
-        meta_parts.append(f"Duration: {duration}")
+        meta_parts.append(f"Duration: {escape_pdf_text(duration)}")
     if total_marks is not None:
         meta_parts.append(f"Total Marks: {total_marks}")
     if meta_parts:
-        story.append(Paragraph(" | ".join(meta_parts), meta_style))
+        story.append(Paragraph(" | ".join(meta_parts), styles['meta']))
     story.append(Spacer(1, 0.2 * inch))
 
     section_map: dict[str, str] = {
@@ -276,9 +460,18 @@ def generate_professional_pdf(
     }
     ordered_types: list[str] = ['mcq', 'short', 'long', 'numerical', 'true_false']
 
+    escaped: dict[int, tuple[str, str, str]] = {
+        id(q): (text, answer, explanation) for q, text, answer, explanation in zip(
+            questions,
+            escape_pdf_texts([q.text or '' for q in questions]),
+            escape_pdf_texts([q.answer or '' for q in questions]),
+            escape_pdf_texts([q.explanation or '' for q in questions]),
+        )
+    }
+
     sections: dict[str, list["Question"]] = {}
     for q in questions:
-        q_type: str = getattr(q, 'question_type', 'short')
+        q_type: str = q.question_type
         sections.setdefault(q_type, []).append(q)
 
     global_num: int = 1
@@ -288,13 +481,14 @@ def generate_professional_pdf(
         if q_type not in sections:
             continue
         section_title: str = section_map.get(q_type, f"Section: {q_type.replace('_', ' ').title()}")
-        story.append(Paragraph(section_title, section_style))
+        story.append(Paragraph(section_title, styles['section']))
         story.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey, spaceAfter=8))
 
         for q in sections[q_type]:
-            marks: int | None = getattr(q, 'marks', None)
+            text, answer, explanation = escaped[id(q)]
+            marks: int | None = q.marks
             marks_text: str = f"  [{marks} marks]" if marks else ""
-            story.append(Paragraph(f"{global_num}. {q.text}{marks_text}", q_style))
+            story.append(Paragraph(f"{global_num}. {text}{marks_text}", styles['q']))
 
             if q_type == 'mcq':
                 options: list | None = getattr(q, 'options', None)
@@ -302,13 +496,12 @@ def generate_professional_pdf(
                     labels: list[str] = ['a', 'b', 'c', 'd', 'e', 'f', 'g', 'h']
                     for idx, opt in enumerate(options):
                         label: str = labels[idx] if idx < len(labels) else str(idx + 1)
-                        story.append(Paragraph(f"({label}) {opt}", option_style))
+                        story.append(Paragraph(f"({label}) {escape_pdf_text(str(opt))}", styles['option']))
 
             story.append(Spacer(1, 0.12 * inch))
 
-            if include_answers and getattr(q, 'answer', None):
-                explanation = getattr(q, 'explanation', '')
-                answer_entries.append((global_num, q.answer, explanation))
+            if include_answers and answer:
+                answer_entries.append((global_num, answer, explanation))
 
             global_num += 1
 
@@ -316,30 +509,30 @@ def generate_professional_pdf(
         if q_type in ordered_types:
             continue
         section_title = f"Section: {q_type.replace('_', ' ').title()}"
-        story.append(Paragraph(section_title, section_style))
+        story.append(Paragraph(section_title, styles['section']))
         story.append(HRFlowable(width="100%", thickness=0.5, color=colors.grey, spaceAfter=8))
 
         for q in qs:
-            marks = getattr(q, 'marks', None)
+            text, answer, explanation = escaped[id(q)]
+            marks = q.marks
             marks_text = f"  [{marks} marks]" if marks else ""
-            story.append(Paragraph(f"{global_num}. {q.text}{marks_text}", q_style))
+            story.append(Paragraph(f"{global_num}. {text}{marks_text}", styles['q']))
             story.append(Spacer(1, 0.12 * inch))
 
-            if include_answers and getattr(q, 'answer', None):
-                explanation = getattr(q, 'explanation', '')
-                answer_entries.append((global_num, q.answer, explanation))
+            if include_answers and answer:
+                answer_entries.append((global_num, answer, explanation))
 
             global_num += 1
 
     if include_answers and answer_entries:
         story.append(PageBreak())
-        story.append(Paragraph("Answer Key", answer_key_title_style))
+        story.append(Paragraph("Answer Key", styles['answer_key_title']))
         story.append(HRFlowable(width="100%", thickness=1, color=colors.black, spaceAfter=10))
 
         for num, answer, explanation in answer_entries:
-            story.append(Paragraph(f"<b>{num}.</b> {answer}", answer_style))
+            story.append(Paragraph(f"<b>{num}.</b> {answer}", styles['answer']))
             if explanation:
-                story.append(Paragraph(f"<i>Explanation: {explanation}</i>", answer_style))
+                story.append(Paragraph(f"<i>Explanation: {explanation}</i>", styles['answer']))
             story.append(Spacer(1, 0.06 * inch))
 
     doc.build(story)
@@ -357,13 +550,13 @@ def generate_docx_file(questions: list["Question"], topic: str, include_answers:
     document.add_paragraph("")
 
     for i, q in enumerate(questions, 1):
-        marks = getattr(q, 'marks', None)
+        marks = q.marks
         marks_text: str = f"  [{marks} marks]" if marks else ""
         q_para = document.add_paragraph()
         run = q_para.add_run(f"{i}. {q.text}{marks_text}")
         run.bold = True
 
-        q_type: str = getattr(q, 'question_type', '')
+        q_type: str = q.question_type
         if q_type == 'mcq':
             options: list | None = getattr(q, 'options', None)
             if options and isinstance(options, list):
@@ -377,13 +570,13 @@ def generate_docx_file(questions: list["Question"], topic: str, include_answers:
         document.add_heading("Answer Key", level=1)
 
         for i, q in enumerate(questions, 1):
-            answer = getattr(q, 'answer', None)
+            answer = q.answer
             if answer:
                 ans_para = document.add_paragraph()
                 ans_para.add_run(f"{i}. ").bold = True
                 ans_para.add_run(str(answer))
 
-                explanation = getattr(q, 'explanation', '')
+                explanation = q.explanation
                 if explanation:
                     exp_para = document.add_paragraph()
                     run = exp_para.add_run(f"   Explanation: {explanation}")
@@ -1,42 +1,98 @@
+import asyncio
+import hashlib
+import logging
 import os
 import uuid
-import json
 import re
 from typing import Any
 from io import BytesIO
-from dotenv import load_dotenv
-import google.generativeai as genai
-from django.http import HttpRequest, HttpResponse
-from django.shortcuts import render, redirect
-from django.db.models import QuerySet
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.paginator import Page, Paginator
+from django.http import FileResponse, HttpRequest, HttpResponse, JsonResponse
+from django.shortcuts import get_object_or_404, render, redirect
+from django.db import transaction
+from django.db.models import Q, QuerySet
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
+from django.utils.functional import cached_property
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import inch
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
 from .models import Question, QuizSession, FlashcardSet, Flashcard
-from .utils import generate_pdf_file, generate_professional_pdf, generate_docx_file, extract_text_from_file
+from .generators import (
+    evaluate_answer_with_gemini,
+    extract_topics_with_gemini,
+    generate_flashcards_with_gemini,
+    generate_short_notes_with_gemini,
+    regenerate_question_with_gemini,
+)
+from .utils import generate_professional_pdf, generate_docx_file, extract_text_from_file, escape_pdf_text, json_dumps
 
 
-dotenv_path = os.path.join(os.path.dirname(__file__), '..', '.env')
-if not os.path.exists(dotenv_path):
-    dotenv_path = os.path.join(os.path.dirname(__file__), '..', 'QuestionGen', '.env')
-load_dotenv(dotenv_path=dotenv_path)
+logger = logging.getLogger(__name__)
 
+_NON_NUMERIC_RE: re.Pattern[str] = re.compile(r'[^\d.\-]')
 
-def get_gemini_model() -> genai.GenerativeModel:
-    api_key: str | None = os.environ.get('GEMINI_API_KEY')
-    if not api_key:
-        raise ValueError("GEMINI_API_KEY environment variable not set")
-    genai.configure(api_key=api_key)
-    return genai.GenerativeModel('gemini-2.5-flash')
+_MAX_SOURCE_CHARS: int = 100000
+_EXTRACTED_TEXT_CACHE_TIMEOUT: int = 60 * 60
 
+_TOPICS_CACHE_KEY: str = 'question_topics'
+_TOPICS_CACHE_TIMEOUT: int = 300
 
-def _clean_gemini_json(response_text: str) -> list[dict[str, Any]] | dict[str, Any]:
-    text: str = response_text.strip()
-    if text.startswith("```"):
-        text = text.split("```")[1]
-        if text.startswith("json"):
-            text = text[4:]
-        text = text.strip()
-    return json.loads(text)
+_NOTES_CACHE_TIMEOUT: int = 60 * 60
+
+_NOTES_IN_CACHE: bool = settings.CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def _build_topics_pdf_styles() -> dict[str, ParagraphStyle]:
+    styles = getSampleStyleSheet()
+    return {
+        'title': ParagraphStyle('TopicTitle', parent=styles['Title'], fontSize=18, spaceAfter=20),
+        'heading': ParagraphStyle('TopicHeading', parent=styles['Heading2'], fontSize=13, spaceAfter=4, textColor=HexColor('#1a3a4a')),
+        'body': ParagraphStyle('TopicBody', parent=styles['Normal'], fontSize=11, spaceAfter=12, leading=16),
+    }
+
+
+def _build_notes_pdf_styles() -> dict[str, ParagraphStyle]:
+    styles = getSampleStyleSheet()
+    return {
+        'heading': ParagraphStyle('NotesHeading', parent=styles['Heading2'], spaceAfter=6),
+        'subheading': ParagraphStyle('NotesSubheading', parent=styles['Heading3'], spaceAfter=4),
+        'body': ParagraphStyle('NotesBody', parent=styles['Normal'], spaceAfter=4, leading=14),
+    }
+
+
+_TOPICS_PDF_STYLES: dict[str, ParagraphStyle] = _build_topics_pdf_styles()
+_NOTES_PDF_STYLES: dict[str, ParagraphStyle] = _build_notes_pdf_styles()
+
+_HISTORY_FIELDS: tuple[str, ...] = (
+    'topic', 'difficulty', 'question_type', 'marks', 'bloom_level', 'created_at', 'text', 'answer',
+)
+_HISTORY_PAGE_SIZE: int = 20
+_HISTORY_COUNT_TIMEOUT: int = 60
+
+_EXPORT_FIELDS: tuple[str, ...] = ('topic', 'text', 'answer', 'explanation', 'question_type', 'marks')
+
+
+def _extract_file_text_cached(study_file: Any) -> str:
+    raw: bytes = study_file.read()
+    hasher = hashlib.sha256(study_file.name.lower().rsplit('.', 1)[-1].encode())
+    hasher.update(raw)
+    cache_key: str = f'txt:{hasher.hexdigest()}:{_MAX_SOURCE_CHARS}'
+
+    text: str | None = cache.get(cache_key)
+    if text is None:
+        text = extract_text_from_file(ContentFile(raw, name=study_file.name), max_chars=_MAX_SOURCE_CHARS)
+        cache.set(cache_key, text, _EXTRACTED_TEXT_CACHE_TIMEOUT)
+    return text
 
 
 def _extract_text(request: HttpRequest) -> tuple[str, str]:
@@ -45,10 +101,10 @@ def _extract_text(request: HttpRequest) -> tuple[str, str]:
     filename: str = 'Pasted Text'
 
     if study_file:
-        text: str = extract_text_from_file(study_file)
+        text: str = _extract_file_text_cached(study_file)
         filename = study_file.name
     elif pasted_text:
-        text = pasted_text
+        text = pasted_text[:_MAX_SOURCE_CHARS]
     else:
         text = ''
 
@@ -63,57 +119,114 @@ def features(request: HttpRequest) -> HttpResponse:
     return render(request, 'features.html')
 
 
+class _CachedCountPaginator(Paginator):
+    def __init__(self, *args: Any, count_key: str, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.count_key = count_key
+
+    @cached_property
+    def count(self) -> int:
+        return cache.get_or_set(self.count_key, self.object_list.count, _HISTORY_COUNT_TIMEOUT)
+
+
+def _question_topics() -> list[str]:
+    return cache.get_or_set(
+        _TOPICS_CACHE_KEY,
+        lambda: list(Question.objects.order_by('topic').values_list('topic', flat=True).distinct()),
+        _TOPICS_CACHE_TIMEOUT,
+    )
+
+
 def history(request: HttpRequest) -> HttpResponse:
-    questions: QuerySet[Question] = Question.objects.all()
-    return render(request, 'history.html', {'questions': questions})
+    current_topic: str = request.GET.get('topic', '')
+    current_difficulty: str = request.GET.get('difficulty', '')
+
+    questions: QuerySet[Question] = Question.objects.only(*_HISTORY_FIELDS)
+    if current_topic:
+        questions = questions.filter(topic=current_topic)
+    if current_difficulty:
+        questions = questions.filter(difficulty=current_difficulty)
+
+    count_key: str = 'question_count:' + hashlib.sha256(f'{current_topic}\x1f{current_difficulty}'.encode()).hexdigest()
+    paginator: _CachedCountPaginator = _CachedCountPaginator(questions, _HISTORY_PAGE_SIZE, count_key=count_key)
+    page_obj: Page = paginator.get_page(request.GET.get('page'))
+
+    return render(request, 'history.html', {
+        'questions': page_obj,
+        'page_obj': page_obj,
+        'topics': _question_topics(),
+        'current_topic': current_topic,
+        'current_difficulty': current_difficulty,
+    })
 
 
-def upload(request: HttpRequest) -> HttpResponse:
+async def upload(request: HttpRequest) -> HttpResponse:
     if request.method == 'POST':
         is_ajax: bool = request.headers.get('x-requested-with') == 'XMLHttpRequest'
         try:
-            text, filename = _extract_text(request)
+            text, filename = await asyncio.to_thread(_extract_text, request)
             difficulty: str = request.POST.get('difficulty', 'Medium')
             num_questions: int = int(request.POST.get('num_questions', 5))
             question_type: str = request.POST.get('question_type', 'SHORT')
-            include_answers: bool = request.POST.get('include_answers', 'no') == 'yes'
 
             if not text.strip():
                 raise ValueError('Please upload a file or paste text')
 
+            topic: str = os.path.splitext(filename)[0] if '.' in filename else filename
+
+            if is_ajax and settings.CELERY_BROKER_URL:
+                from .tasks import generate_questions_task
+                task = await asyncio.to_thread(
+                    generate_questions_task.delay, text, topic, difficulty, num_questions, question_type
+                )
+                return JsonResponse({
+                    'task_id': task.id,
+                    'status_url': f'/upload/status/{task.id}/',
+                }, status=202)
+
             from .generators import generate_questions_with_gemini
-            questions_data = generate_questions_with_gemini(text, difficulty, num_questions, question_type)
+            questions_data = await asyncio.to_thread(
+                generate_questions_with_gemini, text, difficulty, num_questions, question_type
+            )
             if not questions_data:
                 raise ValueError('Could not generate questions. Please check your API key and try again.')
 
-            topic: str = os.path.splitext(filename)[0] if '.' in filename else filename
-            saved_questions: list[Question] = _save_questions(questions_data, topic, difficulty, question_type, share=True)
+            saved_questions: list[Question] = await sync_to_async(_save_questions)(
+                questions_data, topic, difficulty, question_type, share=True
+            )
 
             question_ids: str = ','.join(str(q.id) for q in saved_questions)
             preview_url: str = f'/preview/?ids={question_ids}'
 
             if is_ajax:
-                from django.http import JsonResponse
                 return JsonResponse({'redirect': preview_url})
 
             return redirect(preview_url)
 
         except ValueError as e:
             if is_ajax:
-                from django.http import JsonResponse
                 return JsonResponse({'error': str(e)}, status=400)
-            return render(request, 'upload.html', {'error': str(e)})
+            return await sync_to_async(render)(request, 'upload.html', {'error': str(e)})
         except Exception as e:
-            import traceback
             error_detail = str(e)
-            print(f"ERROR in upload view: {error_detail}")
-            traceback.print_exc()
+            logger.exception("Error in upload view")
             if is_ajax:
-                from django.http import JsonResponse
                 return JsonResponse({'error': f'Server error: {error_detail}'}, status=500)
-            return render(request, 'upload.html', {'error': f'Server error: {error_detail}'})
+            return await sync_to_async(render)(request, 'upload.html', {'error': f'Server error: {error_detail}'})
+
+    return await sync_to_async(render)(request, 'upload.html')
 
-    return render(request, 'upload.html')
+
+def upload_status(request: HttpRequest, task_id: str) -> HttpResponse:
+    from celery.result import AsyncResult
+    from core import celery_app
+
+    result = AsyncResult(task_id, app=celery_app)
+    if result.successful():
+        return JsonResponse(result.result)
+    if result.failed():
+        return JsonResponse({'error': str(result.result)}, status=500)
+    return JsonResponse({'status': result.status.lower()}, status=202)
 
 
 def _save_questions(
@@ -124,7 +237,7 @@ def _save_questions(
     share: bool = False
 ) -> list[Question]:
     share_id: str | None = str(uuid.uuid4()) if share else None
-    saved: list[Question] = []
+    objs: list[Question] = []
     for q_data in questions_data:
         q_text = q_data.get('question', '')
         q_answer = q_data.get('answer', '')
@@ -132,7 +245,7 @@ def _save_questions(
             q_text = str(q_text)
         if isinstance(q_answer, dict):
             q_answer = '\n'.join(f"{k}: {v}" for k, v in q_answer.items())
-        q = Question.objects.create(
+        objs.append(Question(
             text=str(q_text),
             topic=topic,
             difficulty=difficulty,
@@ -141,10 +254,10 @@ def _save_questions(
             explanation=q_data.get('explanation', ''),
             question_type=q_data.get('type', question_type.lower()),
             bloom_level=q_data.get('bloom', 'understand'),
-            share_id=share_id if not saved else None,
-        )
-        saved.append(q)
-    return saved
+            share_id=share_id if not objs else None,
+        ))
+    with transaction.atomic():
+        return Question.objects.bulk_create(objs)
 
 
 def preview_questions(request: HttpRequest) -> HttpResponse:
@@ -171,7 +284,7 @@ def preview_questions(request: HttpRequest) -> HttpResponse:
 def download_preview_pdf(request: HttpRequest) -> HttpResponse:
     ids_str: str = request.GET.get('ids', '')
     ids: list[int] = [int(i) for i in ids_str.split(',') if i.isdigit()]
-    questions: list[Question] = list(Question.objects.filter(id__in=ids))
+    questions: list[Question] = list(Question.objects.filter(id__in=ids).only(*_EXPORT_FIELDS))
     if not questions:
         return HttpResponse('No questions found.', status=400)
 
@@ -182,15 +295,18 @@ def download_preview_pdf(request: HttpRequest) -> HttpResponse:
 
     pdf_buffer: BytesIO = generate_professional_pdf(questions, topic, include_answers, institution, duration)
     suffix: str = "with_answers" if include_answers else "questions_only"
-    response: HttpResponse = HttpResponse(pdf_buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{topic}_{suffix}.pdf"'
-    return response
+    return FileResponse(
+        pdf_buffer,
+        as_attachment=True,
+        filename=f'{topic}_{suffix}.pdf',
+        content_type='application/pdf',
+    )
 
 
 def export_docx(request: HttpRequest) -> HttpResponse:
     ids_str: str = request.GET.get('ids', '')
     ids: list[int] = [int(i) for i in ids_str.split(',') if i.isdigit()]
-    questions: list[Question] = list(Question.objects.filter(id__in=ids))
+    questions: list[Question] = list(Question.objects.filter(id__in=ids).only(*_EXPORT_FIELDS))
     if not questions:
         return HttpResponse('No questions found.', status=400)
 
@@ -198,12 +314,12 @@ def export_docx(request: HttpRequest) -> HttpResponse:
     include_answers: bool = request.GET.get('answers', 'yes') == 'yes'
     docx_buffer: BytesIO = generate_docx_file(questions, topic, include_answers)
 
-    response: HttpResponse = HttpResponse(
-        docx_buffer.getvalue(),
-        content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+    return FileResponse(
+        docx_buffer,
+        as_attachment=True,
+        filename=f'{topic}_questions.docx',
+        content_type='application/vnd.openxmlformats-officedocument.wordprocessingml.document',
     )
-    response['Content-Disposition'] = f'attachment; filename="{topic}_questions.docx"'
-    return response
 
 
 def share_paper(request: HttpRequest, share_id: str) -> HttpResponse:
@@ -227,28 +343,13 @@ def share_paper(request: HttpRequest, share_id: str) -> HttpResponse:
     })
 
 
-from django.db.models import Q
-
-
 def regenerate_question(request: HttpRequest, question_id: int) -> HttpResponse:
-    from django.http import JsonResponse
-    from django.shortcuts import get_object_or_404
-    
     if request.method != 'POST':
         return JsonResponse({'error': 'POST required'}, status=405)
 
     try:
         question: Question = get_object_or_404(Question, id=question_id)
-        model: genai.GenerativeModel = get_gemini_model()
-        prompt: str = f"""Generate 1 {question.difficulty} level {question.get_question_type_display()} question about "{question.topic}".
-
-Return ONLY a JSON object (not array):
-{{"question": "...", "answer": "...", "explanation": "...", "marks": {question.marks}, "type": "{question.question_type}", "bloom": "understand"}}"""
-
-        response = model.generate_content(prompt)
-        data: dict[str, Any] = _clean_gemini_json(response.text)
-        if isinstance(data, list):
-            data = data[0]
+        data: dict[str, Any] = regenerate_question_with_gemini(question)
 
         question.text = data.get('question', question.text)
         question.answer = data.get('answer', question.answer)
@@ -256,7 +357,6 @@ Return ONLY a JSON object (not array):
         question.bloom_level = data.get('bloom', question.bloom_level)
         question.save()
 
-        from django.http import JsonResponse
         return JsonResponse({
             'id': question.id,
             'text': question.text,
@@ -267,18 +367,14 @@ Return ONLY a JSON object (not array):
             'bloom_level': question.bloom_level,
         })
     except Exception as e:
-        from django.http import JsonResponse
         return JsonResponse({'error': str(e)}, status=500)
 
 
 def delete_question(request: HttpRequest, question_id: int) -> HttpResponse:
     if request.method != 'POST':
-        from django.http import JsonResponse
         return JsonResponse({'error': 'POST required'}, status=405)
-    from django.shortcuts import get_object_or_404
     question: Question = get_object_or_404(Question, id=question_id)
     question.delete()
-    from django.http import JsonResponse
     return JsonResponse({'success': True})
 
 
@@ -292,11 +388,12 @@ def start_quiz(request: HttpRequest) -> HttpResponse:
     if not questions:
         return redirect('upload')
 
-    session: QuizSession = QuizSession.objects.create(
-        topic=questions[0].topic,
-        total=len(questions),
-    )
-    session.questions.set(questions)
+    with transaction.atomic():
+        session: QuizSession = QuizSession.objects.create(
+            topic=questions[0].topic,
+            total=len(questions),
+        )
+        session.questions.set(questions)
 
     total_marks: int = sum(q.marks for q in questions)
 
@@ -330,8 +427,8 @@ def submit_quiz(request: HttpRequest, session_id: str) -> HttpResponse:
                 is_correct = user_answer.lower() == correct_answer.lower()
         elif q.question_type == 'numerical':
             try:
-                user_num: float = float(re.sub(r'[^\d.\-]', '', user_answer))
-                correct_num: float = float(re.sub(r'[^\d.\-]', '', correct_answer))
+                user_num: float = float(_NON_NUMERIC_RE.sub('', user_answer))
+                correct_num: float = float(_NON_NUMERIC_RE.sub('', correct_answer))
                 is_correct = abs(user_num - correct_num) < 0.01
             except (ValueError, TypeError):
                 is_correct = user_answer.lower() == correct_answer.lower()
@@ -380,31 +477,18 @@ def flashcards(request: HttpRequest) -> HttpResponse:
             if not text.strip():
                 return render(request, 'flashcards.html', {'error': 'Please upload a file or paste text'})
 
-            model: genai.GenerativeModel = get_gemini_model()
-            prompt: str = f"""Based on the following text, generate 10-20 flashcards for studying.
-Each flashcard should have a "front" (question/term/concept) and "back" (answer/definition/explanation).
-Cover all key concepts.
-
-Text:
-{text}
-
-Return ONLY a JSON array, no markdown, no code blocks:
-[{{"front": "What is ...?", "back": "It is ..."}}]"""
-
-            response = model.generate_content(prompt)
-            cards_data: list[dict[str, str]] = _clean_gemini_json(response.text)
+            cards_data: list[dict[str, str]] = generate_flashcards_with_gemini(text)
+            if not cards_data:
+                return render(request, 'flashcards.html', {'error': 'Could not generate flashcards. Please try again.'})
 
             topic: str = os.path.splitext(filename)[0] if '.' in filename else filename
-            fc_set: FlashcardSet = FlashcardSet.objects.create(topic=topic)
-            cards: list[dict[str, str]] = []
-            for i, c in enumerate(cards_data):
-                card: Flashcard = Flashcard.objects.create(
-                    flashcard_set=fc_set,
-                    front=c.get('front', ''),
-                    back=c.get('back', ''),
-                    order=i,
-                )
-                cards.append({'front': card.front, 'back': card.back})
+            with transaction.atomic():
+                fc_set: FlashcardSet = FlashcardSet.objects.create(topic=topic)
+                saved_cards: list[Flashcard] = Flashcard.objects.bulk_create([
+                    Flashcard(flashcard_set=fc_set, front=c.get('front', ''), back=c.get('back', ''), order=i)
+                    for i, c in enumerate(cards_data)
+                ])
+            cards: list[dict[str, str]] = [{'front': card.front, 'back': card.back} for card in saved_cards]
 
             return render(request, 'flashcards.html', {
                 'cards': cards,
@@ -428,28 +512,9 @@ def evaluate_answer(request: HttpRequest, question_id: int) -> HttpResponse:
             })
 
         try:
-            model: genai.GenerativeModel = get_gemini_model()
-            prompt: str = f"""You are an expert teacher evaluating a student's answer.
-
-Question: {question.text}
-Model Answer: {question.answer}
-Student's Answer: {student_answer}
-Maximum Marks: {question.marks}
-
-Evaluate the student's answer and return ONLY a JSON object (no markdown, no code blocks):
-{{
-    "score": <number out of {question.marks}>,
-    "total": {question.marks},
-    "strengths": "What the student got right...",
-    "weaknesses": "What was missed or incorrect...",
-    "suggestions": "How to improve...",
-    "model_answer": "{question.answer}"
-}}
-
-Be fair but thorough. Give partial marks where appropriate."""
-
-            response = model.generate_content(prompt)
-            evaluation: dict[str, Any] = _clean_gemini_json(response.text)
+            evaluation: dict[str, Any] = evaluate_answer_with_gemini(
+                question.text, question.answer, student_answer, question.marks
+            )
             evaluation['model_answer'] = question.answer
 
             return render(request, 'evaluator.html', {
@@ -509,13 +574,36 @@ def analytics(request: HttpRequest) -> HttpResponse:
         'total_topics': total_topics,
         'total_quizzes': total_quizzes,
         'avg_score': avg_score,
-        'difficulty_data': json.dumps(difficulty_data),
-        'type_data': json.dumps(type_data),
-        'bloom_data': json.dumps(bloom_data),
+        'difficulty_data': json_dumps(difficulty_data),
+        'type_data': json_dumps(type_data),
+        'bloom_data': json_dumps(bloom_data),
         'recent_activity': recent_activity,
     })
 
 
+def _notes_cache_key(session_key: str) -> str:
+    return f'notes:{session_key}'
+
+
+def _store_notes(request: HttpRequest, notes: str, filename: str) -> None:
+    if not _NOTES_IN_CACHE:
+        request.session['short_notes'] = notes
+        request.session['short_notes_filename'] = filename
+        return
+    if request.session.session_key is None:
+        request.session.save()
+    cache.set(_notes_cache_key(request.session.session_key), (notes, filename), _NOTES_CACHE_TIMEOUT)
+
+
+def _load_notes(request: HttpRequest) -> tuple[str, str] | None:
+    if not _NOTES_IN_CACHE:
+        notes: str | None = request.session.get('short_notes')
+        return (notes, request.session.get('short_notes_filename', 'notes')) if notes else None
+    if not request.session.session_key:
+        return None
+    return cache.get(_notes_cache_key(request.session.session_key))
+
+
 def short_notes(request: HttpRequest) -> HttpResponse:
     if request.method == 'POST':
         try:
@@ -527,8 +615,7 @@ def short_notes(request: HttpRequest) -> HttpResponse:
             if not notes:
                 return render(request, 'short_notes.html', {'error': 'Could not generate notes. Please try again.'})
 
-            request.session['short_notes'] = notes
-            request.session['short_notes_filename'] = filename
+            _store_notes(request, notes, filename)
 
             return render(request, 'short_notes.html', {
                 'success': True,
@@ -541,22 +628,6 @@ def short_notes(request: HttpRequest) -> HttpResponse:
     return render(request, 'short_notes.html')
 
 
-def generate_short_notes_with_gemini(text: str) -> str | None:
-    model: genai.GenerativeModel = get_gemini_model()
-    prompt: str = f"""Generate concise short notes for studying from this text.
-Organize by topic with ## headings and ### subheadings. Use bullet points.
-
-Text:
-{text}"""
-
-    try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
-    except Exception as e:
-        print(f"DEBUG: Error generating notes: {e}")
-        return None
-
-
 def pdf_topic_generator(request: HttpRequest) -> HttpResponse:
     if request.method == 'POST':
         try:
@@ -582,34 +653,7 @@ def pdf_topic_generator(request: HttpRequest) -> HttpResponse:
     return render(request, 'pdf_topic_generator.html')
 
 
-def extract_topics_with_gemini(text: str) -> list[dict[str, str]]:
-    model: genai.GenerativeModel = get_gemini_model()
-    prompt: str = f"""Analyze the following text and extract the key topics/concepts.
-For each, provide a brief explanation.
-
-Text:
-{text}
-
-Return ONLY a JSON array, no markdown, no code blocks:
-[{{"topic": "Topic Name", "explanation": "Brief explanation"}}]
-
-Extract 5 to 15 topics."""
-
-    try:
-        response = model.generate_content(prompt)
-        return _clean_gemini_json(response.text)
-    except Exception as e:
-        print(f"DEBUG: Error extracting topics: {e}")
-        return []
-
-
 def download_topics_pdf(request: HttpRequest) -> HttpResponse:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-    from reportlab.lib.units import inch
-    from reportlab.lib.colors import HexColor
-
     topics: list[dict[str, str]] | None = request.session.get('extracted_topics')
     filename: str = request.session.get('extracted_topics_filename', 'topics')
     if not topics:
@@ -617,70 +661,67 @@ def download_topics_pdf(request: HttpRequest) -> HttpResponse:
 
     buffer: BytesIO = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-
-    title_style = ParagraphStyle('TopicTitle', parent=styles['Title'], fontSize=18, spaceAfter=20)
-    heading_style = ParagraphStyle('TopicHeading', parent=styles['Heading2'], fontSize=13, spaceAfter=4, textColor=HexColor('#1a3a4a'))
-    body_style = ParagraphStyle('TopicBody', parent=styles['Normal'], fontSize=11, spaceAfter=12, leading=16)
+    styles = _TOPICS_PDF_STYLES
 
     story: list = []
     topic_label: str = os.path.splitext(filename)[0] if '.' in filename else filename
-    story.append(Paragraph(f'Topics Extracted from: {topic_label}', title_style))
+    story.append(Paragraph(f'Topics Extracted from: {topic_label}', styles['title']))
     story.append(Spacer(1, 12))
 
     for i, item in enumerate(topics, 1):
-        topic_name: str = str(item.get('topic', '')).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        explanation: str = str(item.get('explanation', '')).replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-        story.append(Paragraph(f'{i}. {topic_name}', heading_style))
-        story.append(Paragraph(explanation, body_style))
+        topic_name: str = escape_pdf_text(str(item.get('topic', '')))
+        explanation: str = escape_pdf_text(str(item.get('explanation', '')))
+        story.append(Paragraph(f'{i}. {topic_name}', styles['heading']))
+        story.append(Paragraph(explanation, styles['body']))
 
     doc.build(story)
     buffer.seek(0)
 
     safe_name: str = os.path.splitext(filename)[0]
-    response: HttpResponse = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{safe_name}_topics.pdf"'
-    return response
+    return FileResponse(
+        buffer,
+        as_attachment=True,
+        filename=f'{safe_name}_topics.pdf',
+        content_type='application/pdf',
+    )
 
 
 def download_notes_pdf(request: HttpRequest) -> HttpResponse:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-
-    notes: str | None = request.session.get('short_notes')
-    filename: str = request.session.get('short_notes_filename', 'notes')
-    if not notes:
+    cached: tuple[str, str] | None = _load_notes(request)
+    if not cached:
         return HttpResponse('No notes available. Please generate notes first.', status=400)
 
+    notes, filename = cached
+
     buffer: BytesIO = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=A4, topMargin=0.75*inch, bottomMargin=0.75*inch)
-    styles = getSampleStyleSheet()
-    heading_style = ParagraphStyle('NotesHeading', parent=styles['Heading2'], spaceAfter=6)
-    body_style = ParagraphStyle('NotesBody', parent=styles['Normal'], spaceAfter=4, leading=14)
+    styles = _NOTES_PDF_STYLES
 
     story: list = []
     for line in notes.split('\n'):
         line = line.strip()
         if not line:
             story.append(Spacer(1, 6))
-        elif line.startswith('## '):
-            story.append(Paragraph(line[3:], heading_style))
-        elif line.startswith('### '):
-            story.append(Paragraph(line[4:], ParagraphStyle('Sub', parent=styles['Heading3'], spaceAfter=4)))
+        elif line[:3] == '## ':
+            story.append(Paragraph(line[3:], styles['heading']))
+        elif line[:4] == '### ':
+            story.append(Paragraph(line[4:], styles['subheading']))
         else:
-            clean: str = line.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-            if clean.startswith('- ') or clean.startswith('* '):
+            clean: str = escape_pdf_text(line)
+            if clean[:2] in ('- ', '* '):
                 clean = '&bull; ' + clean[2:]
-            story.append(Paragraph(clean, body_style))
+            story.append(Paragraph(clean, styles['body']))
 
     doc.build(story)
     buffer.seek(0)
 
     topic: str = os.path.splitext(filename)[0]
-    response: HttpResponse = HttpResponse(buffer.getvalue(), content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="{topic}_short_notes.pdf"'
-    return response
+    return FileResponse(
+        buffer,
+        as_attachment=True,
+        filename=f'{topic}_short_notes.pdf',
+        content_type='application/pdf',
+    )
 
 
 def signup_view(request: HttpRequest) -> HttpResponse: